@@ -5,6 +5,7 @@ Contains all database models, connections, and operations
 
 from app.database.connection import (
     get_db,
+    get_engine,
     engine,
     SessionLocal,
     DatabaseSession,
@@ -34,6 +35,7 @@ from app.database.init_db import (
 __all__ = [
     # Connection utilities
     "get_db",
+    "get_engine",
     "engine",
     "SessionLocal",
     "DatabaseSession",
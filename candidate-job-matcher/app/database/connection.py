@@ -14,6 +14,7 @@ from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from typing import Generator
+import functools
 import logging
 
 from app.config import settings
@@ -26,9 +27,11 @@ logger = logging.getLogger(__name__)
 # Database Engine Configuration
 # ==========================================
 
+@functools.lru_cache(maxsize=1)
 def get_engine():
     """
     Create and configure SQLAlchemy engine
+    Memoized so every caller (and every Streamlit rerun) shares one engine and pool
     """
     database_url = settings.get_database_url()
     
@@ -73,7 +76,7 @@ def get_engine():
     return engine
 
 
-# Create engine instance
+# Shared engine instance
 engine = get_engine()
 
 
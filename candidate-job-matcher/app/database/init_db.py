@@ -33,6 +33,13 @@ def create_tables():
     try:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        
+        # create_all skips tables that already exist, so add any indexes
+        # defined after those tables were first created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        
         logger.info("All tables created successfully!")
         return True
     except Exception as e:
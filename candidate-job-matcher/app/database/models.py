@@ -5,16 +5,23 @@ SQLAlchemy ORM models for the application
 
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Float, 
-    ForeignKey, Enum, JSON, Boolean
+    ForeignKey, Enum, JSON, Boolean, Index, DDL, event, func, literal_column, text
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import enum
 
 
 Base = declarative_base()
 
+# Trigram indexes on PostgreSQL need the pg_trgm extension before any DDL runs
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 
 # ==========================================
 # Enums
@@ -45,6 +52,30 @@ class Job(Base):
     Stores job descriptions and requirements
     """
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Job listing filters by status and orders by newest first
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        # Full-text search over title and description (PostgreSQL only);
+        # must stay identical to the document built in Job.search_condition()
+        Index(
+            "ix_jobs_search_tsv",
+            text("to_tsvector('english', title || ' ' || description)"),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        # Trigram indexes so substring ILIKE searches avoid full scans (PostgreSQL only)
+        Index(
+            "ix_jobs_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_jobs_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -89,6 +120,22 @@ class Job(Base):
     def __repr__(self):
         return f"<Job(id={self.id}, title='{self.title}', status='{self.status.value}')>"
     
+    @classmethod
+    def search_condition(cls, search_query: str):
+        """
+        Build a PostgreSQL full-text match on title and description
+        Served by the ix_jobs_search_tsv GIN index
+        
+        Args:
+            search_query: Free-text search string
+            
+        Returns:
+            SQLAlchemy boolean expression
+        """
+        config = literal_column("'english'")
+        document = func.to_tsvector(config, cls.title + literal_column("' '") + cls.description)
+        return document.op("@@")(func.plainto_tsquery(config, search_query))
+    
     def to_dict(self):
         """Convert model to dictionary"""
         return {
@@ -115,6 +162,23 @@ class Candidate(Base):
     Stores candidate information and parsed resume text
     """
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Candidate lists filter by job and show the newest uploads first
+        Index("ix_candidates_job_id_uploaded_at", "job_id", text("uploaded_at DESC")),
+        # Trigram indexes for name/email substring search (PostgreSQL only)
+        Index(
+            "ix_candidates_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_candidates_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -133,8 +197,8 @@ class Candidate(Base):
     file_type = Column(String(10), nullable=False)  # pdf, docx, txt
     file_size = Column(Integer, nullable=True)  # Size in bytes
     
-    # Parsed Resume
-    parsed_text = Column(Text, nullable=False)
+    # Parsed Resume (deferred: only loaded when accessed, since it can be large)
+    parsed_text = deferred(Column(Text, nullable=False))
     
     # Metadata
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
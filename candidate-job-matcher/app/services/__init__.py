@@ -20,7 +20,8 @@ from app.services.analysis_service import (
     analyze_and_store_candidate,
     analyze_all_candidates_for_job,
     get_candidates_with_analysis,
-    get_analysis_statistics
+    get_analysis_statistics,
+    get_analysis_overview
 )
 
 __all__ = [
@@ -40,4 +41,5 @@ __all__ = [
     "analyze_all_candidates_for_job",
     "get_candidates_with_analysis",
     "get_analysis_statistics",
+    "get_analysis_overview",
 ]
\ No newline at end of file
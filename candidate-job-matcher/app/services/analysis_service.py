@@ -12,8 +12,10 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import logging
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 from datetime import datetime
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.orm import undefer
 
 from app.database import DatabaseSession, Candidate, AnalysisResult, Job, AnalysisStatus
 from app.services.document_parser import parse_resume
@@ -51,8 +53,10 @@ def analyze_and_store_candidate(
     
     try:
         with DatabaseSession() as db:
-            # Fetch candidate
-            candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+            # Fetch candidate (with the deferred resume text, which the LLM needs)
+            candidate = db.query(Candidate).options(
+                undefer(Candidate.parsed_text)
+            ).filter(Candidate.id == candidate_id).first()
             if not candidate:
                 result["error"] = f"Candidate {candidate_id} not found"
                 return result
@@ -155,12 +159,16 @@ def analyze_and_store_candidate(
 # Batch Analysis
 # ==========================================
 
-def analyze_all_candidates_for_job(job_id: int) -> Dict:
+def analyze_all_candidates_for_job(
+    job_id: int,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Dict:
     """
     Analyze all candidates for a specific job
     
     Args:
         job_id: Job database ID
+        progress_callback: Optional callable invoked as (completed, total) after each candidate
         
     Returns:
         Dictionary with batch analysis results
@@ -194,7 +202,7 @@ def analyze_all_candidates_for_job(job_id: int) -> Dict:
             logger.info(f"Starting batch analysis for {len(candidates)} candidates")
             
             # Analyze each candidate
-            for candidate in candidates:
+            for index, candidate in enumerate(candidates, start=1):
                 logger.info(f"Analyzing candidate {candidate.id}: {candidate.name}")
                 
                 analysis_result = analyze_and_store_candidate(
@@ -208,6 +216,9 @@ def analyze_all_candidates_for_job(job_id: int) -> Dict:
                     result["analyzed"] += 1
                 else:
                     result["failed"] += 1
+                
+                if progress_callback:
+                    progress_callback(index, len(candidates))
             
             result["success"] = True
             logger.info(f"Batch analysis complete: {result['analyzed']}/{result['total_candidates']} successful")
@@ -224,6 +235,117 @@ def analyze_all_candidates_for_job(job_id: int) -> Dict:
 # Get Analysis Results
 # ==========================================
 
+def _candidates_with_analysis_query(job_id: int, sort_by: str = "score") -> Select:
+    """
+    Build the query behind get_candidates_with_analysis()
+    
+    Args:
+        job_id: Job database ID
+        sort_by: Sort criteria ("score", "name", "date")
+        
+    Returns:
+        SELECT of candidate and analysis columns
+    """
+    # Completed analyses rank by score; everything else sorts last
+    score_key = case(
+        (AnalysisResult.status == AnalysisStatus.COMPLETED, AnalysisResult.relevance_score),
+        else_=-1
+    )
+    order_by = {
+        "score": score_key.desc(),
+        "name": Candidate.name.asc(),
+        "date": Candidate.uploaded_at.desc(),
+    }.get(sort_by)
+    
+    # One outer join instead of lazy-loading each candidate's analysis (N+1)
+    stmt = (
+        select(
+            Candidate.id,
+            Candidate.name,
+            Candidate.email,
+            Candidate.phone,
+            Candidate.file_name,
+            Candidate.uploaded_at,
+            AnalysisResult.id.label("analysis_id"),
+            AnalysisResult.relevance_score,
+            AnalysisResult.matched_skills,
+            AnalysisResult.missing_skills,
+            AnalysisResult.feedback,
+            AnalysisResult.strengths,
+            AnalysisResult.weaknesses,
+            AnalysisResult.experience_match,
+            AnalysisResult.education_match,
+            AnalysisResult.status,
+            AnalysisResult.analyzed_at,
+            AnalysisResult.updated_at.label("analysis_updated_at"),
+            AnalysisResult.error_message,
+        )
+        .outerjoin(AnalysisResult, AnalysisResult.candidate_id == Candidate.id)
+        .where(Candidate.job_id == job_id)
+    )
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    
+    return stmt
+
+
+def _intern_skills(skills: Optional[List]) -> Optional[List]:
+    """
+    Intern skill names so repeats across candidates share one string object
+    
+    Args:
+        skills: Skill list decoded from the JSON column, or None
+        
+    Returns:
+        Skill list with interned strings, or None
+    """
+    if not skills:
+        return skills
+    return [sys.intern(skill) if type(skill) is str else skill for skill in skills]
+
+
+def _candidate_row_to_dict(row) -> Dict:
+    """
+    Convert one row of _candidates_with_analysis_query() into a candidate dictionary
+    
+    Args:
+        row: Result row
+        
+    Returns:
+        Candidate dictionary with nested analysis data
+    """
+    candidate_data = {
+        "id": row.id,
+        "name": row.name,
+        "email": row.email,
+        "phone": row.phone,
+        "file_name": row.file_name,
+        "uploaded_at": row.uploaded_at,
+        "analysis": None,
+        "has_analysis": False
+    }
+    
+    # Attach analysis if exists
+    if row.analysis_id is not None:
+        candidate_data["analysis"] = {
+            "relevance_score": row.relevance_score,
+            "matched_skills": _intern_skills(row.matched_skills),
+            "missing_skills": _intern_skills(row.missing_skills),
+            "feedback": row.feedback,
+            "strengths": row.strengths,
+            "weaknesses": row.weaknesses,
+            "experience_match": row.experience_match,
+            "education_match": row.education_match,
+            "status": row.status.value,
+            "analyzed_at": row.analyzed_at,
+            "updated_at": row.analysis_updated_at,
+            "error_message": row.error_message
+        }
+        candidate_data["has_analysis"] = row.status == AnalysisStatus.COMPLETED
+    
+    return candidate_data
+
+
 def get_candidates_with_analysis(job_id: int, sort_by: str = "score") -> List[Dict]:
     """
     Get all candidates with their analysis results for a job
@@ -237,57 +359,10 @@ def get_candidates_with_analysis(job_id: int, sort_by: str = "score") -> List[Di
     """
     try:
         with DatabaseSession() as db:
-            # Query candidates with their analysis results
-            candidates = db.query(Candidate).filter(
-                Candidate.job_id == job_id
-            ).all()
-            
-            results = []
-            
-            for candidate in candidates:
-                candidate_data = {
-                    "id": candidate.id,
-                    "name": candidate.name,
-                    "email": candidate.email,
-                    "phone": candidate.phone,
-                    "file_name": candidate.file_name,
-                    "uploaded_at": candidate.uploaded_at,
-                    "analysis": None,
-                    "has_analysis": False
-                }
-                
-                # Get analysis if exists
-                if candidate.analysis_result:
-                    analysis = candidate.analysis_result
-                    candidate_data["analysis"] = {
-                        "relevance_score": analysis.relevance_score,
-                        "matched_skills": analysis.matched_skills,
-                        "missing_skills": analysis.missing_skills,
-                        "feedback": analysis.feedback,
-                        "strengths": analysis.strengths,
-                        "weaknesses": analysis.weaknesses,
-                        "experience_match": analysis.experience_match,
-                        "education_match": analysis.education_match,
-                        "status": analysis.status.value,
-                        "analyzed_at": analysis.analyzed_at,
-                        "error_message": analysis.error_message
-                    }
-                    candidate_data["has_analysis"] = analysis.status == AnalysisStatus.COMPLETED
-                
-                results.append(candidate_data)
-            
-            # Sort results
-            if sort_by == "score":
-                results.sort(
-                    key=lambda x: x["analysis"]["relevance_score"] if x["has_analysis"] else -1,
-                    reverse=True
-                )
-            elif sort_by == "name":
-                results.sort(key=lambda x: x["name"])
-            elif sort_by == "date":
-                results.sort(key=lambda x: x["uploaded_at"], reverse=True)
-            
-            return results
+            return [
+                _candidate_row_to_dict(row)
+                for row in db.execute(_candidates_with_analysis_query(job_id, sort_by))
+            ]
     
     except Exception as e:
         logger.error(f"Error fetching candidates with analysis: {e}")
@@ -298,6 +373,69 @@ def get_candidates_with_analysis(job_id: int, sort_by: str = "score") -> List[Di
 # Statistics
 # ==========================================
 
+def _analysis_statistics_query(job_id: int) -> Select:
+    """
+    Build the single aggregate query behind get_analysis_statistics()
+    
+    Args:
+        job_id: Job database ID
+        
+    Returns:
+        SELECT of (total, analyzed, failed, average score)
+    """
+    completed = AnalysisResult.status == AnalysisStatus.COMPLETED
+    
+    # Count and average in one aggregate query instead of hydrating every candidate
+    return (
+        select(
+            func.count(Candidate.id),
+            func.count(AnalysisResult.id).filter(completed),
+            func.count(AnalysisResult.id).filter(AnalysisResult.status == AnalysisStatus.FAILED),
+            func.avg(AnalysisResult.relevance_score).filter(completed),
+        )
+        .select_from(Candidate)
+        .outerjoin(AnalysisResult, AnalysisResult.candidate_id == Candidate.id)
+        .where(Candidate.job_id == job_id)
+    )
+
+
+def _statistics_from_row(row) -> Dict:
+    """
+    Derive the statistics dictionary from a _analysis_statistics_query() row
+    
+    Args:
+        row: (total, analyzed, failed, average score) result row
+        
+    Returns:
+        Dictionary with statistics
+    """
+    total, analyzed, failed, avg_score = row
+    
+    pending = total - analyzed - failed
+    avg_score = float(avg_score) if avg_score is not None else 0
+    
+    return {
+        "total_candidates": total,
+        "analyzed": analyzed,
+        "pending": pending,
+        "failed": failed,
+        "average_score": round(avg_score, 2),
+        "completion_rate": round((analyzed / total * 100), 2) if total > 0 else 0
+    }
+
+
+def _empty_statistics() -> Dict:
+    """Statistics returned when they cannot be calculated"""
+    return {
+        "total_candidates": 0,
+        "analyzed": 0,
+        "pending": 0,
+        "failed": 0,
+        "average_score": 0,
+        "completion_rate": 0
+    }
+
+
 def get_analysis_statistics(job_id: int) -> Dict:
     """
     Get analysis statistics for a job
@@ -310,47 +448,36 @@ def get_analysis_statistics(job_id: int) -> Dict:
     """
     try:
         with DatabaseSession() as db:
-            candidates = db.query(Candidate).filter(Candidate.job_id == job_id).all()
-            
-            total = len(candidates)
-            analyzed = 0
-            pending = 0
-            failed = 0
-            total_score = 0
-            
-            for candidate in candidates:
-                if candidate.analysis_result:
-                    if candidate.analysis_result.status == AnalysisStatus.COMPLETED:
-                        analyzed += 1
-                        total_score += candidate.analysis_result.relevance_score
-                    elif candidate.analysis_result.status == AnalysisStatus.FAILED:
-                        failed += 1
-                    else:
-                        pending += 1
-                else:
-                    pending += 1
-            
-            avg_score = (total_score / analyzed) if analyzed > 0 else 0
-            
-            return {
-                "total_candidates": total,
-                "analyzed": analyzed,
-                "pending": pending,
-                "failed": failed,
-                "average_score": round(avg_score, 2),
-                "completion_rate": round((analyzed / total * 100), 2) if total > 0 else 0
-            }
+            return _statistics_from_row(db.execute(_analysis_statistics_query(job_id)).one())
     
     except Exception as e:
         logger.error(f"Error calculating statistics: {e}")
-        return {
-            "total_candidates": 0,
-            "analyzed": 0,
-            "pending": 0,
-            "failed": 0,
-            "average_score": 0,
-            "completion_rate": 0
-        }
+        return _empty_statistics()
+
+
+def get_analysis_overview(job_id: int, sort_by: str = "score") -> Tuple[Dict, List[Dict]]:
+    """
+    Get statistics and candidates with analysis for a job using a single session
+    
+    Args:
+        job_id: Job database ID
+        sort_by: Sort criteria ("score", "name", "date")
+        
+    Returns:
+        Tuple of (statistics dictionary, list of candidates with analysis data)
+    """
+    try:
+        with DatabaseSession() as db:
+            stats = _statistics_from_row(db.execute(_analysis_statistics_query(job_id)).one())
+            candidates = [
+                _candidate_row_to_dict(row)
+                for row in db.execute(_candidates_with_analysis_query(job_id, sort_by))
+            ]
+            return stats, candidates
+    
+    except Exception as e:
+        logger.error(f"Error loading analysis overview: {e}")
+        return _empty_statistics(), []
 
 
 # ==========================================
@@ -11,9 +11,12 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import io
-from datetime import datetime
-from typing import List, Dict
+import json
+from datetime import date, datetime
+from typing import List, Dict, Mapping, Sequence
 
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -24,10 +27,19 @@ from reportlab.platypus import (
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, generate_json falls back to the stdlib encoder
+    orjson = None
+
 from app.utils.helpers import format_percentage
 from app.config import settings
 
 
+# Rows pyarrow serializes per batch in generate_csv()
+CSV_CHUNK_ROWS = 10_000
+
+
 # ==========================================
 # PDF Report Generator
 # ==========================================
@@ -427,6 +439,54 @@ def generate_pdf_report(
     return generator.generate_report(job_info, candidates_data, output_path)
 
 
+def generate_csv(columns: Mapping[str, Sequence]) -> bytes:
+    """
+    Write column-oriented export data as CSV with pyarrow's CSV writer
+    
+    The columns become an Arrow table and are written in batches of
+    CSV_CHUNK_ROWS straight into an Arrow buffer. Even with
+    quoting_style="needed", Arrow quotes the header and every string-typed
+    value; numeric columns are written unquoted, and floats in Arrow's
+    shortest form (85.0 becomes 85), so callers that need a fixed number
+    of decimals pass those columns pre-formatted as strings.
+    
+    Args:
+        columns: Ordered mapping of header to equal-length column values
+        
+    Returns:
+        UTF-8 encoded CSV
+    """
+    buffer = pa.BufferOutputStream()
+    pacsv.write_csv(
+        pa.table(dict(columns)),
+        buffer,
+        pacsv.WriteOptions(batch_size=CSV_CHUNK_ROWS, quoting_style="needed")
+    )
+    return buffer.getvalue().to_pybytes()
+
+
+def generate_json(data: Dict) -> bytes:
+    """
+    Serialize export data as indented JSON, using orjson when it is installed
+    
+    Args:
+        data: Export data; may contain datetime values
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _json_default(value):
+    """Serialize datetimes the way orjson does for the stdlib fallback"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 # ==========================================
 # Test Function
 # ==========================================
@@ -3,4 +3,10 @@ UI Package
 Contains Streamlit UI components and pages
 """
 
-__all__ = []
\ No newline at end of file
+from app.ui.fragments import fragment
+from app.ui.styles import inject_styles
+
+__all__ = [
+    "fragment",
+    "inject_styles",
+]
\ No newline at end of file
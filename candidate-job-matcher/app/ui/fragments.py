@@ -0,0 +1,28 @@
+"""
+UI Fragments
+Compatibility wrapper for Streamlit fragments
+"""
+
+import streamlit as st
+
+
+# st.fragment (1.37+) or st.experimental_fragment (1.33-1.36); None on older releases
+_FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def fragment(func):
+    """
+    Mark a rendering function as a Streamlit fragment
+    Widget interactions inside a fragment rerun only that function. On Streamlit
+    releases without fragment support the function is returned unchanged and
+    simply runs as part of the full-page script.
+    
+    Args:
+        func: Rendering function
+        
+    Returns:
+        Fragment-wrapped function, or func itself
+    """
+    if _FRAGMENT is None:
+        return func
+    return _FRAGMENT(func)
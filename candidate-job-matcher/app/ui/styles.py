@@ -0,0 +1,236 @@
+"""
+UI Styles
+Stylesheets for the home page and each Streamlit page
+"""
+
+import re
+
+import streamlit as st
+
+
+# ==========================================
+# Page Stylesheets
+# ==========================================
+
+# Home page
+HOME_CSS = """
+.main-header {
+    font-size: 3rem;
+    font-weight: bold;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+.sub-header {
+    font-size: 1.5rem;
+    color: #555;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.feature-box {
+    background-color: #f0f2f6;
+    padding: 1.5rem;
+    border-radius: 10px;
+    margin: 1rem 0;
+}
+.feature-title {
+    font-size: 1.3rem;
+    font-weight: bold;
+    color: #1f77b4;
+    margin-bottom: 0.5rem;
+}
+.feature-desc {
+    color: #666;
+    font-size: 1rem;
+}
+"""
+
+# Job Management page
+JOB_MANAGEMENT_CSS = """
+.job-card {
+    background-color: #f0f2f6;
+    padding: 1.5rem;
+    border-radius: 10px;
+    margin: 1rem 0;
+    border-left: 5px solid #1f77b4;
+}
+.job-title {
+    font-size: 1.5rem;
+    font-weight: bold;
+    color: #1f77b4;
+}
+.job-meta {
+    color: #666;
+    font-size: 0.9rem;
+    margin-top: 0.5rem;
+}
+.status-active {
+    background-color: #28a745;
+    color: white;
+    padding: 0.3rem 0.8rem;
+    border-radius: 5px;
+    font-size: 0.85rem;
+}
+.status-draft {
+    background-color: #6c757d;
+    color: white;
+    padding: 0.3rem 0.8rem;
+    border-radius: 5px;
+    font-size: 0.85rem;
+}
+.status-closed {
+    background-color: #dc3545;
+    color: white;
+    padding: 0.3rem 0.8rem;
+    border-radius: 5px;
+    font-size: 0.85rem;
+}
+"""
+
+# Candidate Upload page
+CANDIDATE_UPLOAD_CSS = """
+.upload-section {
+    background-color: #f0f2f6;
+    padding: 2rem;
+    border-radius: 10px;
+    margin: 1rem 0;
+}
+.candidate-card {
+    background-color: white;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 0.5rem 0;
+    border-left: 4px solid #1f77b4;
+}
+.candidate-name {
+    font-size: 1.2rem;
+    font-weight: bold;
+    color: #1f77b4;
+}
+.candidate-info {
+    color: #666;
+    font-size: 0.9rem;
+}
+.success-badge {
+    background-color: #28a745;
+    color: white;
+    padding: 0.2rem 0.6rem;
+    border-radius: 4px;
+    font-size: 0.8rem;
+}
+.pending-badge {
+    background-color: #ffc107;
+    color: black;
+    padding: 0.2rem 0.6rem;
+    border-radius: 4px;
+    font-size: 0.8rem;
+}
+"""
+
+# Analysis Results page
+ANALYSIS_RESULTS_CSS = """
+.metric-card {
+    background-color: #f0f2f6;
+    padding: 1.5rem;
+    border-radius: 10px;
+    text-align: center;
+}
+.score-high {
+    color: #28a745;
+    font-size: 2rem;
+    font-weight: bold;
+}
+.score-medium {
+    color: #ffc107;
+    font-size: 2rem;
+    font-weight: bold;
+}
+.score-low {
+    color: #dc3545;
+    font-size: 2rem;
+    font-weight: bold;
+}
+.candidate-card {
+    background-color: white;
+    padding: 1.5rem;
+    border-radius: 10px;
+    margin: 1rem 0;
+    border-left: 5px solid #1f77b4;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+.skill-badge {
+    display: inline-block;
+    background-color: #e3f2fd;
+    color: #1976d2;
+    padding: 0.3rem 0.8rem;
+    border-radius: 15px;
+    margin: 0.2rem;
+    font-size: 0.85rem;
+}
+.skill-badge-missing {
+    display: inline-block;
+    background-color: #ffebee;
+    color: #c62828;
+    padding: 0.3rem 0.8rem;
+    border-radius: 15px;
+    margin: 0.2rem;
+    font-size: 0.85rem;
+}
+"""
+
+# Export Data page
+EXPORT_DATA_CSS = """
+.export-card {
+    background-color: #f0f2f6;
+    padding: 2rem;
+    border-radius: 10px;
+    margin: 1rem 0;
+}
+.format-option {
+    background-color: white;
+    padding: 1.5rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+    border: 2px solid #1f77b4;
+}
+"""
+
+
+# ==========================================
+# Style Injection
+# ==========================================
+
+def _minify_css(css: str) -> str:
+    """
+    Strip insignificant whitespace from a stylesheet
+    
+    Args:
+        css: Stylesheet text
+        
+    Returns:
+        Minified stylesheet
+    """
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,])\s*", r"\1", css).strip()
+
+
+# <style> tags are built and minified once per process instead of on every rerun
+_STYLE_TAGS = {
+    "home": f"<style>{_minify_css(HOME_CSS)}</style>",
+    "job_management": f"<style>{_minify_css(JOB_MANAGEMENT_CSS)}</style>",
+    "candidate_upload": f"<style>{_minify_css(CANDIDATE_UPLOAD_CSS)}</style>",
+    "analysis_results": f"<style>{_minify_css(ANALYSIS_RESULTS_CSS)}</style>",
+    "export_data": f"<style>{_minify_css(EXPORT_DATA_CSS)}</style>",
+}
+
+
+def inject_styles(page: str) -> None:
+    """
+    Emit the stylesheet for a page
+    Must be called on every rerun, since Streamlit clears elements that a run does not re-emit
+    
+    Args:
+        page: Stylesheet name ("home", "job_management", "candidate_upload",
+            "analysis_results" or "export_data")
+    """
+    st.markdown(_STYLE_TAGS[page], unsafe_allow_html=True)
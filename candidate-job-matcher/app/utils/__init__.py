@@ -13,6 +13,7 @@ from app.utils.validators import (
     extract_email,
     validate_phone,
     extract_phone,
+    extract_contacts_batch,
     extract_name_from_filename,
     extract_name_from_text,
     validate_job_title,
@@ -23,6 +24,7 @@ from app.utils.helpers import (
     generate_unique_filename,
     get_file_hash,
     safe_file_path,
+    safe_filename_part,
     get_file_size_mb,
     ensure_directory_exists,
     clean_text,
@@ -50,6 +52,7 @@ __all__ = [
     "extract_email",
     "validate_phone",
     "extract_phone",
+    "extract_contacts_batch",
     "extract_name_from_filename",
     "extract_name_from_text",
     "validate_job_title",
@@ -59,6 +62,7 @@ __all__ = [
     "generate_unique_filename",
     "get_file_hash",
     "safe_file_path",
+    "safe_filename_part",
     "get_file_size_mb",
     "ensure_directory_exists",
     "clean_text",
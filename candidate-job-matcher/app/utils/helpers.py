@@ -13,12 +13,26 @@ sys.path.insert(0, str(project_root))
 import os
 import uuid
 import hashlib
-from datetime import datetime
+from bisect import bisect_right
+from datetime import datetime, timezone
 from typing import Optional
 import logging
 
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, get_file_hash falls back to MD5
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
+# Read size used when hashing files
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Module-level bindings for functions called on every upload
+_md5 = hashlib.md5
+_now = datetime.now
+_uuid4 = uuid.uuid4
+
 
 # ==========================================
 # File Operations
@@ -34,21 +48,19 @@ def generate_unique_filename(original_filename: str) -> str:
     Returns:
         Unique filename with timestamp and UUID
     """
-    # Get file extension
-    file_ext = Path(original_filename).suffix
-    
-    # Get base name without extension
-    base_name = Path(original_filename).stem
+    # Get file extension and base name without extension
+    original_path = Path(original_filename)
+    file_ext, base_name = original_path.suffix, original_path.stem
     
     # Clean base name (remove special chars)
     clean_name = "".join(c for c in base_name if c.isalnum() or c in (' ', '-', '_'))
     clean_name = clean_name[:50]  # Limit length
     
     # Generate timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _now().strftime("%Y%m%d_%H%M%S")
     
     # Generate short UUID
-    short_uuid = str(uuid.uuid4())[:8]
+    short_uuid = str(_uuid4())[:8]
     
     # Combine
     unique_filename = f"{clean_name}_{timestamp}_{short_uuid}{file_ext}"
@@ -58,21 +70,23 @@ def generate_unique_filename(original_filename: str) -> str:
 
 def get_file_hash(file_path: str) -> str:
     """
-    Calculate MD5 hash of a file
+    Calculate a fast content hash of a file for deduplication
+    Uses xxHash3 (128-bit) when available, MD5 otherwise.
+    This is not a cryptographic hash; use hashlib.sha256 for integrity checks.
     
     Args:
         file_path: Path to the file
         
     Returns:
-        MD5 hash string
+        Hex digest string
     """
-    hash_md5 = hashlib.md5()
+    file_hash = xxhash.xxh3_128() if xxhash is not None else _md5()
     
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            file_hash.update(chunk)
     
-    return hash_md5.hexdigest()
+    return file_hash.hexdigest()
 
 
 def safe_file_path(directory: str, filename: str) -> Path:
@@ -102,6 +116,23 @@ def safe_file_path(directory: str, filename: str) -> Path:
     return file_path
 
 
+# Characters that are unsafe in download file names, mapped to "_" in one translate pass
+_FILENAME_TRANSLATION = str.maketrans({" ": "_", "/": "_", "\\": "_", ":": "_"})
+
+
+def safe_filename_part(text: str) -> str:
+    """
+    Make text (e.g. a job title) safe to embed in a download file name
+    
+    Args:
+        text: Text to sanitize
+        
+    Returns:
+        Text with spaces and path/drive separators replaced by underscores
+    """
+    return text.translate(_FILENAME_TRANSLATION)
+
+
 def get_file_size_mb(file_path: str) -> float:
     """
     Get file size in megabytes
@@ -199,6 +230,16 @@ def extract_first_n_words(text: str, n: int = 50) -> str:
 # Date/Time Helpers
 # ==========================================
 
+# Upper bounds (in seconds) for "just now", minutes, hours and days
+_TIME_AGO_THRESHOLDS = (60, 3600, 86400, 2592000)
+
+_TIME_AGO_UNITS = (
+    (60, "minute", "minutes"),
+    (3600, "hour", "hours"),
+    (86400, "day", "days"),
+)
+
+
 def format_datetime(dt: datetime, format_str: str = "%Y-%m-%d %H:%M:%S") -> str:
     """
     Format datetime object to string
@@ -229,30 +270,32 @@ def get_time_ago(dt: datetime) -> str:
     if not dt:
         return "Unknown"
     
-    now = datetime.utcnow()
-    diff = now - dt
+    # Database timestamps are naive UTC, so only compare aware with aware
+    now = datetime.now(timezone.utc)
+    if dt.tzinfo is None:
+        now = now.replace(tzinfo=None)
+    
+    seconds = (now - dt).total_seconds()
     
-    seconds = diff.total_seconds()
+    bucket = bisect_right(_TIME_AGO_THRESHOLDS, seconds)
     
-    if seconds < 60:
+    if bucket == 0:
         return "Just now"
-    elif seconds < 3600:
-        minutes = int(seconds / 60)
-        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-    elif seconds < 86400:
-        hours = int(seconds / 3600)
-        return f"{hours} hour{'s' if hours != 1 else ''} ago"
-    elif seconds < 2592000:
-        days = int(seconds / 86400)
-        return f"{days} day{'s' if days != 1 else ''} ago"
-    else:
+    if bucket == len(_TIME_AGO_THRESHOLDS):
         return format_datetime(dt, "%Y-%m-%d")
+    
+    unit_seconds, singular, plural = _TIME_AGO_UNITS[bucket - 1]
+    count = int(seconds / unit_seconds)
+    return f"{count} {singular if count == 1 else plural} ago"
 
 
 # ==========================================
 # Number Formatting
 # ==========================================
 
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format
@@ -263,11 +306,9 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted string like "1.5 MB"
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # Each unit spans 10 bits, so the bit length picks the unit directly
+    unit_index = min((max(int(size_bytes), 1).bit_length() - 1) // 10, len(_FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_FILE_SIZE_UNITS[unit_index]}"
 
 
 def format_percentage(value: float, decimals: int = 1) -> str:
@@ -405,10 +446,11 @@ if __name__ == "__main__":
     # Test time ago
     print("\n4. Time Ago:")
     from datetime import timedelta
+    now = datetime.now(timezone.utc)
     times = [
-        datetime.utcnow() - timedelta(minutes=5),
-        datetime.utcnow() - timedelta(hours=2),
-        datetime.utcnow() - timedelta(days=3),
+        now - timedelta(minutes=5),
+        now - timedelta(hours=2),
+        now - timedelta(days=3),
     ]
     for dt in times:
         ago = get_time_ago(dt)
@@ -10,15 +10,38 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import re
 import os
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import logging
 
+try:
+    # google-re2 is a linear-time, non-backtracking engine with the same API
+    import re2 as re
+except ImportError:  # google-re2 is optional, the stdlib engine is used otherwise
+    import re
+
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns (none use backreferences or lookarounds, so all are RE2-compatible)
+_FILENAME_RE = re.compile(r'^[a-zA-Z0-9._\-\s()]+$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_EMAIL_FIND_RE = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+_PHONE_SEPARATORS_RE = re.compile(r'[\s\-\(\)\.]')
+_PHONE_VALID_RE = re.compile(r'^\+?\d{10,15}$')
+# Common phone patterns, tried in order at each position
+_PHONE_RE = re.compile(
+    r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'  # +1-123-456-7890
+    r'|\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'  # (123) 456-7890
+    r'|\d{10}'  # 1234567890
+)
+_FILENAME_KEYWORDS_RE = re.compile(r'(?i)resume|cv|curriculum|vitae|updated|final|latest')
+_FILENAME_SEPARATORS_RE = re.compile(r'[_\-\.]')
+_NAME_RE = re.compile(r'^[a-zA-Z\s]+$')
+_NAME_WORD_RE = re.compile(r'^[a-zA-Z\s\.\-]+$')
+_TEN_DIGITS_RE = re.compile(r'\d{10}')
+
 
 # ==========================================
 # File Validation
@@ -90,7 +113,7 @@ def validate_filename(filename: str) -> Tuple[bool, str]:
         return False, "Invalid filename: path traversal detected"
     
     # Check for special characters
-    if not re.match(r'^[a-zA-Z0-9._\-\s()]+$', filename):
+    if not _FILENAME_RE.match(filename):
         return False, "Invalid filename: contains special characters"
     
     return True, "Valid filename"
@@ -168,8 +191,7 @@ def validate_email(email: str) -> bool:
     if not email:
         return False
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def extract_email(text: str) -> Optional[str]:
@@ -182,12 +204,8 @@ def extract_email(text: str) -> Optional[str]:
     Returns:
         First email found or None
     """
-    email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-    matches = re.findall(email_pattern, text)
-    
-    if matches:
-        return matches[0]
-    return None
+    match = _EMAIL_FIND_RE.search(text)
+    return match.group(0) if match else None
 
 
 # ==========================================
@@ -208,10 +226,10 @@ def validate_phone(phone: str) -> bool:
         return False
     
     # Remove common separators
-    cleaned = re.sub(r'[\s\-\(\)\.]', '', phone)
+    cleaned = _PHONE_SEPARATORS_RE.sub('', phone)
     
     # Check if it's a valid phone number (10-15 digits)
-    return bool(re.match(r'^\+?\d{10,15}$', cleaned))
+    return bool(_PHONE_VALID_RE.match(cleaned))
 
 
 def extract_phone(text: str) -> Optional[str]:
@@ -224,25 +242,67 @@ def extract_phone(text: str) -> Optional[str]:
     Returns:
         First phone number found or None
     """
-    # Common phone patterns
-    patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # +1-123-456-7890
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-        r'\d{10}',  # 1234567890
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            return matches[0]
+    match = _PHONE_RE.search(text)
+    return match.group(0) if match else None
+
+
+# ==========================================
+# Batch Contact Extraction
+# ==========================================
+
+def extract_contacts_batch(texts: List[str]) -> Dict[str, List[Optional[str]]]:
+    """
+    Extract email and phone from many resume texts in one pass per field
+    Returns columns (one list per field) instead of one dict per resume;
+    for a single resume use extract_email / extract_phone
     
-    return None
+    Args:
+        texts: Resume text contents
+        
+    Returns:
+        Dictionary with "email" and "phone" lists aligned with texts (None if not found)
+    """
+    import pandas as pd
+    
+    series = pd.Series(texts, dtype="object")
+    
+    # str.extract compiles with the stdlib engine, so pass the pattern source
+    emails = series.str.extract(f"({_EMAIL_FIND_RE.pattern})", expand=False)
+    phones = series.str.extract(f"({_PHONE_RE.pattern})", expand=False)
+    
+    return {
+        "email": emails.where(emails.notna(), None).tolist(),
+        "phone": phones.where(phones.notna(), None).tolist(),
+    }
 
 
 # ==========================================
 # Name Extraction
 # ==========================================
 
+# Names appear at the top of a resume, so only this many characters are scanned
+_NAME_SCAN_CHARS = 2048
+
+
+def _capitalize_name_part(part: str) -> str:
+    """Capitalize one part of a name, keeping the "Mc" prefix intact (McDonald)"""
+    lower = part.lower()
+    if lower.startswith("mc") and len(lower) > 2:
+        return "Mc" + lower[2:].capitalize()
+    return lower.capitalize()
+
+
+def _smart_title(value: str) -> str:
+    """
+    Title-case a name word by word
+    Unlike str.title(), keeps "McDonald" and hyphenated names like "Smith-Jones" intact
+    """
+    return " ".join(
+        "-".join(_capitalize_name_part(part) for part in word.split("-"))
+        for word in value.split()
+    )
+
+
 def extract_name_from_filename(filename: str) -> Optional[str]:
     """
     Extract candidate name from filename
@@ -258,21 +318,19 @@ def extract_name_from_filename(filename: str) -> Optional[str]:
     name = Path(filename).stem
     
     # Remove common keywords
-    keywords = ['resume', 'cv', 'curriculum', 'vitae', 'updated', 'final', 'latest']
-    for keyword in keywords:
-        name = re.sub(keyword, '', name, flags=re.IGNORECASE)
+    name = _FILENAME_KEYWORDS_RE.sub('', name)
     
     # Replace separators with spaces
-    name = re.sub(r'[_\-\.]', ' ', name)
+    name = _FILENAME_SEPARATORS_RE.sub(' ', name)
     
     # Remove extra spaces
     name = ' '.join(name.split())
     
     # Title case
-    name = name.title()
+    name = _smart_title(name)
     
     # Return only if it looks like a valid name (2-50 chars, letters only)
-    if 2 <= len(name) <= 50 and re.match(r'^[a-zA-Z\s]+$', name):
+    if 2 <= len(name) <= 50 and _NAME_RE.match(name):
         return name
     
     return None
@@ -289,22 +347,22 @@ def extract_name_from_text(text: str) -> Optional[str]:
     Returns:
         Extracted name or None
     """
-    # Get first few lines
-    lines = text.split('\n')[:5]
+    # Get first few lines (only split the head, not the whole document)
+    lines = text[:_NAME_SCAN_CHARS].split('\n', 5)[:5]
     
     for line in lines:
         line = line.strip()
         
         # Skip empty lines and lines with emails/phones
-        if not line or '@' in line or re.search(r'\d{10}', line):
+        if not line or '@' in line or _TEN_DIGITS_RE.search(line):
             continue
         
         # Check if line looks like a name (2-4 words, mostly letters)
         words = line.split()
         if 2 <= len(words) <= 4:
             # Check if mostly alphabetic
-            if all(re.match(r'^[a-zA-Z\s\.\-]+$', word) for word in words):
-                return line.title()
+            if all(_NAME_WORD_RE.match(word) for word in words):
+                return _smart_title(line)
     
     return None
 
@@ -6,6 +6,8 @@ Main Streamlit Entry Point - Home Page
 import streamlit as st
 from pathlib import Path
 
+from app.ui import inject_styles
+
 # Page configuration
 st.set_page_config(
     page_title="Candidate-Job Matcher",
@@ -15,39 +17,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #555;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .feature-box {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .feature-title {
-        font-size: 1.3rem;
-        font-weight: bold;
-        color: #1f77b4;
-        margin-bottom: 0.5rem;
-    }
-    .feature-desc {
-        color: #666;
-        font-size: 1rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_styles("home")
 
 # Main content
 st.markdown('<div class="main-header">LLM-Powered Candidate-Job Matcher</div>', unsafe_allow_html=True)
@@ -132,13 +102,29 @@ with step_col4:
 st.markdown("---")
 
 # Statistics (if database has data)
-try:
+@st.cache_data(ttl=60, show_spinner=False)
+def get_system_statistics() -> tuple:
+    """
+    Count jobs, candidates and analyses in a single round trip
+    
+    Returns:
+        Tuple of (total_jobs, total_candidates, total_analyses)
+    """
+    from sqlalchemy import func, select
     from app.database import DatabaseSession, Job, Candidate, AnalysisResult
     
+    stmt = select(
+        select(func.count()).select_from(Job).scalar_subquery(),
+        select(func.count()).select_from(Candidate).scalar_subquery(),
+        select(func.count()).select_from(AnalysisResult).scalar_subquery(),
+    )
+    
     with DatabaseSession() as db:
-        total_jobs = db.query(Job).count()
-        total_candidates = db.query(Candidate).count()
-        total_analyses = db.query(AnalysisResult).count()
+        return tuple(db.execute(stmt).one())
+
+
+try:
+    total_jobs, total_candidates, total_analyses = get_system_statistics()
     
     st.markdown("## System Statistics")
     
@@ -3,19 +3,15 @@ Job Management Page
 Create, view, edit, and manage job postings
 """
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 import streamlit as st
+import html
 from datetime import datetime
+from sqlalchemy import func, select
 
-from app.database import DatabaseSession, Job, JobStatus
+from app.database import DatabaseSession, Job, Candidate, JobStatus, engine
 from app.utils.validators import validate_job_title, validate_job_description
 from app.utils.helpers import format_datetime, get_time_ago
+from app.ui import inject_styles
 
 # Page config
 st.set_page_config(
@@ -25,48 +21,144 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .job-card {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        border-left: 5px solid #1f77b4;
-    }
-    .job-title {
-        font-size: 1.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-    }
-    .job-meta {
-        color: #666;
-        font-size: 0.9rem;
-        margin-top: 0.5rem;
-    }
-    .status-active {
-        background-color: #28a745;
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 5px;
-        font-size: 0.85rem;
-    }
-    .status-draft {
-        background-color: #6c757d;
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 5px;
-        font-size: 0.85rem;
-    }
-    .status-closed {
-        background-color: #dc3545;
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 5px;
-        font-size: 0.85rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_styles("job_management")
+
+# ==========================================
+# Data Loading
+# ==========================================
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_jobs(status_filter: str, search_query: str, candidates_version: int) -> list:
+    """
+    Fetch jobs for the listing as plain dictionaries
+    Cached between reruns; call fetch_jobs.clear() after creating or deleting a job
+    
+    Args:
+        status_filter: "All" or a job status label (e.g. "Active")
+        search_query: Text to match against title and description
+        candidates_version: Session's candidates_version token, bumped by Candidate
+            Upload after uploads and deletes so candidate counts stay current
+        
+    Returns:
+        List of job dictionaries
+    """
+    # Select only the columns the listing renders; no ORM instances are built
+    stmt = (
+        select(
+            Job.id,
+            Job.title,
+            Job.description,
+            Job.requirements,
+            Job.location,
+            Job.department,
+            Job.employment_type,
+            Job.experience_level,
+            Job.salary_range,
+            Job.status,
+            Job.created_at,
+            func.count(Candidate.id).label("candidate_count"),
+        )
+        .outerjoin(Candidate, Candidate.job_id == Job.id)
+        .group_by(Job.id)
+    )
+    
+    # Apply status filter
+    if status_filter != "All":
+        status_enum = JobStatus[status_filter.upper()]
+        stmt = stmt.where(Job.status == status_enum)
+    
+    # Apply search filter
+    if search_query:
+        search_pattern = f"%{search_query}%"
+        search_filter = (
+            (Job.title.ilike(search_pattern)) | 
+            (Job.description.ilike(search_pattern))
+        )
+        
+        if engine.dialect.name == "postgresql":
+            # Substring matches use the trigram indexes, word matches the full-text index
+            search_filter = search_filter | Job.search_condition(search_query)
+        
+        stmt = stmt.where(search_filter)
+    
+    with DatabaseSession() as db:
+        rows = db.execute(stmt.order_by(Job.created_at.desc())).mappings().all()
+    
+    jobs = []
+    for row in rows:
+        job = dict(row)
+        job["status"] = job["status"].value
+        jobs.append(job)
+    
+    return jobs
+
+
+def build_job_card_html(job: dict) -> str:
+    """
+    Build the HTML for a job card so it is sent as a single markdown element
+    
+    Args:
+        job: Job dictionary from fetch_jobs()
+        
+    Returns:
+        HTML string for the card body
+    """
+    # Status badge and title
+    status = job["status"]
+    parts = [
+        f'<span class="status-{status}">{status.upper()}</span>',
+        f'<div class="job-title">{html.escape(job["title"])}</div>',
+    ]
+    
+    # Metadata
+    created_ago = get_time_ago(job["created_at"])
+    parts.append(
+        f'<div class="job-meta">Created {created_ago} | {job["candidate_count"]} candidates</div>'
+    )
+    
+    # Description preview
+    description = job["description"]
+    desc_preview = description[:200] + "..." if len(description) > 200 else description
+    parts.append(f'<p><strong>Description:</strong> {html.escape(desc_preview)}</p>')
+    
+    # Additional info
+    info_parts = []
+    if job["location"]:
+        info_parts.append(f"Location: {html.escape(job['location'])}")
+    if job["department"]:
+        info_parts.append(f"Department: {html.escape(job['department'])}")
+    if job["experience_level"]:
+        info_parts.append(f"Experience: {html.escape(job['experience_level'])}")
+    if info_parts:
+        parts.append(f'<p>{" | ".join(info_parts)}</p>')
+    
+    return f'<div class="job-card">{"".join(parts)}</div>'
+
+
+# Actions offered by each job card's selector
+JOB_ACTIONS = ["View", "Edit", "Delete"]
+
+
+def handle_job_action(job_id: int) -> None:
+    """
+    Apply the action chosen in a job card's action selector
+    Runs as an on_change callback, then resets the selector so it can be reused
+    
+    Args:
+        job_id: Job database ID
+    """
+    key = f"action_{job_id}"
+    action = st.session_state.get(key)
+    
+    if action == "View":
+        st.session_state[f"show_details_{job_id}"] = True
+    elif action == "Edit":
+        st.session_state.edit_job_id = job_id
+    elif action == "Delete":
+        st.session_state.delete_job_id = job_id
+    
+    st.session_state[key] = None
+
 
 # Header
 st.title("Job Management")
@@ -83,145 +175,107 @@ tab1, tab2 = st.tabs(["View Jobs", "Create New Job"])
 with tab1:
     st.subheader("Active Job Postings")
     
-    # Filters
-    filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
-    
-    with filter_col1:
-        status_filter = st.selectbox(
-            "Filter by Status",
-            ["All", "Active", "Draft", "Closed"],
-            key="status_filter"
-        )
-    
-    with filter_col2:
-        search_query = st.text_input(
-            "Search Jobs",
-            placeholder="Search by title or description...",
-            key="search_query"
-        )
-    
-    with filter_col3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        refresh_btn = st.button("Refresh", use_container_width=True)
+    # Filters (in a form so typing or changing status doesn't rerun the page until applied)
+    with st.form("job_filters", border=False):
+        filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
+        
+        with filter_col1:
+            status_filter = st.selectbox(
+                "Filter by Status",
+                ["All", "Active", "Draft", "Closed"],
+                key="status_filter"
+            )
+        
+        with filter_col2:
+            search_query = st.text_input(
+                "Search Jobs",
+                placeholder="Search by title or description...",
+                key="search_query"
+            )
+        
+        with filter_col3:
+            st.markdown("<br>", unsafe_allow_html=True)
+            apply_btn = st.form_submit_button("Apply / Refresh", use_container_width=True)
     
     st.markdown("---")
     
+    if apply_btn:
+        fetch_jobs.clear()
+    
     # Fetch jobs
     try:
-        with DatabaseSession() as db:
-            query = db.query(Job)
-            
-            # Apply status filter
-            if status_filter != "All":
-                status_enum = JobStatus[status_filter.upper()]
-                query = query.filter(Job.status == status_enum)
-            
-            # Apply search filter
-            if search_query:
-                search_pattern = f"%{search_query}%"
-                query = query.filter(
-                    (Job.title.ilike(search_pattern)) | 
-                    (Job.description.ilike(search_pattern))
-                )
-            
-            jobs = query.order_by(Job.created_at.desc()).all()
+        jobs = fetch_jobs(status_filter, search_query, st.session_state.get("candidates_version", 0))
+        
+        if not jobs:
+            st.info("No jobs found. Create your first job in the 'Create New Job' tab!")
+        else:
+            st.markdown(f"**Found {len(jobs)} job(s)**")
             
-            if not jobs:
-                st.info("No jobs found. Create your first job in the 'Create New Job' tab!")
-            else:
-                st.markdown(f"**Found {len(jobs)} job(s)**")
-                
-                for job in jobs:
-                    # Job card
-                    with st.container():
-                        col1, col2 = st.columns([4, 1])
-                        
-                        with col1:
-                            # Status badge
-                            status_class = f"status-{job.status.value}"
-                            st.markdown(f'<span class="{status_class}">{job.status.value.upper()}</span>', unsafe_allow_html=True)
-                            
-                            # Job title
-                            st.markdown(f'<div class="job-title">{job.title}</div>', unsafe_allow_html=True)
-                            
-                            # Metadata
-                            candidate_count = len(job.candidates) if job.candidates else 0
-                            created_ago = get_time_ago(job.created_at)
+            for job in jobs:
+                # Job card
+                with st.container():
+                    col1, col2 = st.columns([4, 1])
+                    
+                    with col1:
+                        st.markdown(build_job_card_html(job), unsafe_allow_html=True)
+                    
+                    with col2:
+                        # One action selector per card instead of three buttons
+                        st.selectbox(
+                            "Actions",
+                            JOB_ACTIONS,
+                            index=None,
+                            placeholder="Actions...",
+                            key=f"action_{job['id']}",
+                            on_change=handle_job_action,
+                            args=(job["id"],),
+                            label_visibility="collapsed"
+                        )
+                    
+                    # Show details if toggled
+                    if st.session_state.get(f"show_details_{job['id']}", False):
+                        with st.expander("Full Details", expanded=True):
+                            st.markdown("**Full Description:**")
+                            st.text_area("", job["description"], height=150, disabled=True, key=f"desc_{job['id']}")
                             
-                            st.markdown(
-                                f'<div class="job-meta">Created {created_ago} | {candidate_count} candidates</div>',
-                                unsafe_allow_html=True
-                            )
+                            if job["requirements"]:
+                                st.markdown("**Requirements:**")
+                                st.text_area("", job["requirements"], height=100, disabled=True, key=f"req_{job['id']}")
                             
-                            # Description preview
-                            desc_preview = job.description[:200] + "..." if len(job.description) > 200 else job.description
-                            st.markdown(f"**Description:** {desc_preview}")
+                            if job["salary_range"]:
+                                st.markdown(f"**Salary Range:** {job['salary_range']}")
                             
-                            # Additional info
-                            if job.location or job.department or job.experience_level:
-                                info_parts = []
-                                if job.location:
-                                    info_parts.append(f"Location: {job.location}")
-                                if job.department:
-                                    info_parts.append(f"Department: {job.department}")
-                                if job.experience_level:
-                                    info_parts.append(f"Experience: {job.experience_level}")
-                                st.markdown(" | ".join(info_parts))
-                        
-                        with col2:
-                            # Action buttons
-                            if st.button("View", key=f"view_{job.id}", use_container_width=True):
-                                st.session_state[f"show_details_{job.id}"] = True
+                            if job["employment_type"]:
+                                st.markdown(f"**Employment Type:** {job['employment_type']}")
                             
-                            if st.button("Edit", key=f"edit_{job.id}", use_container_width=True):
-                                st.session_state.edit_job_id = job.id
+                            if st.button("Close", key=f"close_{job['id']}"):
+                                st.session_state[f"show_details_{job['id']}"] = False
                                 st.rerun()
+                    
+                    st.markdown("---")
+                
+                # Handle delete confirmation
+                if st.session_state.get("delete_job_id") == job["id"]:
+                    st.warning(f"Are you sure you want to delete '{job['title']}'? This will also delete all associated candidates and analysis results.")
+                    
+                    del_col1, del_col2, del_col3 = st.columns([1, 1, 3])
+                    with del_col1:
+                        if st.button("Yes, Delete", key=f"confirm_delete_{job['id']}", type="primary"):
+                            with DatabaseSession() as del_db:
+                                job_to_delete = del_db.query(Job).filter(Job.id == job["id"]).first()
+                                if job_to_delete:
+                                    del_db.delete(job_to_delete)
+                                    del_db.commit()
                             
-                            if st.button("Delete", key=f"delete_{job.id}", use_container_width=True, type="secondary"):
-                                st.session_state.delete_job_id = job.id
-                        
-                        # Show details if toggled
-                        if st.session_state.get(f"show_details_{job.id}", False):
-                            with st.expander("Full Details", expanded=True):
-                                st.markdown("**Full Description:**")
-                                st.text_area("", job.description, height=150, disabled=True, key=f"desc_{job.id}")
-                                
-                                if job.requirements:
-                                    st.markdown("**Requirements:**")
-                                    st.text_area("", job.requirements, height=100, disabled=True, key=f"req_{job.id}")
-                                
-                                if job.salary_range:
-                                    st.markdown(f"**Salary Range:** {job.salary_range}")
-                                
-                                if job.employment_type:
-                                    st.markdown(f"**Employment Type:** {job.employment_type}")
-                                
-                                if st.button("Close", key=f"close_{job.id}"):
-                                    st.session_state[f"show_details_{job.id}"] = False
-                                    st.rerun()
-                        
-                        st.markdown("---")
+                            fetch_jobs.clear()
+                            st.success(f"Job '{job['title']}' deleted successfully!")
+                            del st.session_state.delete_job_id
+                            st.rerun()
                     
-                    # Handle delete confirmation
-                    if st.session_state.get("delete_job_id") == job.id:
-                        st.warning(f"Are you sure you want to delete '{job.title}'? This will also delete all associated candidates and analysis results.")
-                        
-                        del_col1, del_col2, del_col3 = st.columns([1, 1, 3])
-                        with del_col1:
-                            if st.button("Yes, Delete", key=f"confirm_delete_{job.id}", type="primary"):
-                                with DatabaseSession() as del_db:
-                                    job_to_delete = del_db.query(Job).filter(Job.id == job.id).first()
-                                    if job_to_delete:
-                                        del_db.delete(job_to_delete)
-                                        del_db.commit()
-                                        st.success(f"Job '{job.title}' deleted successfully!")
-                                        del st.session_state.delete_job_id
-                                        st.rerun()
-                        
-                        with del_col2:
-                            if st.button("Cancel", key=f"cancel_delete_{job.id}"):
-                                del st.session_state.delete_job_id
-                                st.rerun()
+                    with del_col2:
+                        if st.button("Cancel", key=f"cancel_delete_{job['id']}"):
+                            del st.session_state.delete_job_id
+                            st.rerun()
     
     except Exception as e:
         st.error(f"Error loading jobs: {str(e)}")
@@ -332,12 +386,14 @@ with tab2:
                         
                         db.add(new_job)
                         db.commit()
-                        
-                        st.success(f"Job '{job_title}' created successfully!")
-                        st.info("Navigate to 'Candidate Upload' to start adding candidates.")
-                        
-                        # Clear form by rerunning
-                        st.balloons()
+                    
+                    fetch_jobs.clear()
+                    
+                    st.success(f"Job '{job_title}' created successfully!")
+                    st.info("Navigate to 'Candidate Upload' to start adding candidates.")
+                    
+                    # Clear form by rerunning
+                    st.balloons()
                 
                 except Exception as e:
                     st.error(f"Error creating job: {str(e)}")
@@ -3,18 +3,16 @@ Candidate Upload Page
 Upload and manage candidate resumes for job positions
 """
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 import streamlit as st
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from datetime import datetime
+from pathlib import Path
+from sqlalchemy import delete, func, or_, select
 
-from app.database import DatabaseSession, Job, Candidate, JobStatus
+from app.database import DatabaseSession, Job, Candidate, AnalysisResult, JobStatus
 from app.services.document_parser import parse_resume
 from app.utils.helpers import (
     generate_unique_filename,
@@ -24,6 +22,221 @@ from app.utils.helpers import (
     get_time_ago
 )
 from app.config import settings
+from app.ui import fragment, inject_styles
+
+# Upper bound on concurrent resume parsers
+MAX_PARSE_WORKERS = 8
+
+# Searches at least this long are run in the database; shorter ones filter in memory
+MIN_SQL_SEARCH_LENGTH = 2
+
+# Maximum number of progress updates sent per upload batch
+MAX_PROGRESS_UPDATES = 50
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Background threads used to remove deleted candidates' resume files
+FILE_CLEANUP_WORKERS = 2
+
+# Bounds on the in-memory parse cache, which holds full resume text (PII)
+PARSE_CACHE_MAX_ENTRIES = 200
+PARSE_CACHE_TTL = 3600
+
+
+class _ParseFailure(Exception):
+    """Carries a failed parse result out of the cached parser so it is not stored"""
+    
+    def __init__(self, result: dict):
+        super().__init__(result.get("error"))
+        self.result = result
+
+
+@st.cache_data(max_entries=PARSE_CACHE_MAX_ENTRIES, ttl=PARSE_CACHE_TTL, show_spinner=False)
+def _parse_resume_cached(file_hash: str, filename: str, file_size: int, _file_path: str) -> dict:
+    """
+    Parse a resume, caching only successful results in memory
+    
+    Args:
+        file_hash: SHA-256 of the file contents
+        filename: Original filename (affects file type and name fallback)
+        file_size: File size in bytes
+        _file_path: Path of the saved file (excluded from the cache key)
+        
+    Returns:
+        Dictionary with parsing results
+        
+    Raises:
+        _ParseFailure: Parsing failed; st.cache_data does not cache exceptions
+    """
+    result = parse_resume(file_path=_file_path, filename=filename, file_size=file_size)
+    if not result["success"]:
+        raise _ParseFailure(result)
+    return result
+
+
+def parse_resume_cached(file_hash: str, filename: str, file_size: int, file_path: str) -> dict:
+    """
+    Parse a resume, reusing the cached result when identical bytes are uploaded again
+    Failed parses are returned but never cached, so a retry parses the file afresh
+    
+    Args:
+        file_hash: SHA-256 of the file contents
+        filename: Original filename (affects file type and name fallback)
+        file_size: File size in bytes
+        file_path: Path of the saved file
+        
+    Returns:
+        Dictionary with parsing results
+    """
+    try:
+        return _parse_resume_cached(file_hash, filename, file_size, file_path)
+    except _ParseFailure as failure:
+        return failure.result
+
+
+def save_and_parse_resume(uploaded_file, upload_dir: Path) -> tuple:
+    """
+    Save an uploaded resume to the upload folder and parse it
+    Runs on a worker thread, so one file's disk write overlaps other files' parsing
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile
+        upload_dir: Directory to save the file in
+        
+    Returns:
+        Tuple of (file_path, file_size, parse_result)
+    """
+    # Generate unique filename
+    unique_filename = generate_unique_filename(uploaded_file.name)
+    file_path = safe_file_path(str(upload_dir), unique_filename)
+    
+    # Save file (streamed in chunks rather than copied whole), hashing as it is written
+    hasher = hashlib.sha256()
+    uploaded_file.seek(0)
+    with open(file_path, "wb") as f:
+        while chunk := uploaded_file.read(UPLOAD_COPY_CHUNK_SIZE):
+            hasher.update(chunk)
+            f.write(chunk)
+    
+    # UploadedFile already knows its size; no need to stat the written file
+    file_size = uploaded_file.size
+    
+    # Parse resume (cached by content hash)
+    parse_result = parse_resume_cached(
+        hasher.hexdigest(),
+        uploaded_file.name,
+        file_size,
+        str(file_path)
+    )
+    
+    return file_path, file_size, parse_result
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_candidates(job_id: int, version: int, search: str = "") -> list:
+    """
+    Load the candidate list for a job as plain dictionaries
+    
+    Args:
+        job_id: Job database ID
+        version: Session's candidates_version token; bumped after uploads and deletes
+        search: Optional text matched case-insensitively against name and email
+        
+    Returns:
+        List of candidate dictionaries, newest upload first; each carries a
+        pre-lowered "search_text" so in-memory filtering doesn't re-lowercase per rerun
+    """
+    stmt = (
+        select(
+            Candidate.id,
+            Candidate.name,
+            Candidate.email,
+            Candidate.phone,
+            Candidate.file_name,
+            Candidate.file_size,
+            Candidate.file_path,
+            Candidate.uploaded_at,
+            AnalysisResult.id.isnot(None).label("has_analysis")
+        )
+        .outerjoin(AnalysisResult, AnalysisResult.candidate_id == Candidate.id)
+        .where(Candidate.job_id == job_id)
+        .order_by(Candidate.uploaded_at.desc())
+    )
+    
+    if search:
+        # autoescape so "%" and "_" in the query match literally, like a plain substring search
+        stmt = stmt.where(
+            or_(
+                Candidate.name.icontains(search, autoescape=True),
+                Candidate.email.icontains(search, autoescape=True)
+            )
+        )
+    
+    with DatabaseSession() as db:
+        rows = db.execute(stmt).mappings().all()
+    
+    candidates = []
+    for row in rows:
+        candidate = dict(row)
+        # NUL separator keeps a query from matching across the name/email boundary
+        candidate["search_text"] = f"{candidate['name'].lower()}\0{(candidate['email'] or '').lower()}"
+        candidates.append(candidate)
+    
+    return candidates
+
+
+@st.cache_resource
+def get_file_cleanup_executor() -> ThreadPoolExecutor:
+    """
+    Shared executor for resume file removal, so deletes don't block the script on disk I/O
+    
+    Returns:
+        Process-wide ThreadPoolExecutor
+    """
+    return ThreadPoolExecutor(max_workers=FILE_CLEANUP_WORKERS, thread_name_prefix="file-cleanup")
+
+
+def remove_file(file_path: str) -> None:
+    """
+    Remove a file, ignoring one that is already gone
+    
+    Args:
+        file_path: Path of the file to remove
+    """
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def delete_candidate(candidate_id: int, file_path: str) -> None:
+    """
+    Delete a candidate and its analysis with plain DELETE statements, then queue the file removal
+    
+    Args:
+        candidate_id: Candidate database ID
+        file_path: Stored resume path from the cached candidate row
+    """
+    with DatabaseSession() as db:
+        # Bulk deletes skip the ORM cascade, so remove the analysis row explicitly
+        db.execute(delete(AnalysisResult).where(AnalysisResult.candidate_id == candidate_id))
+        db.execute(delete(Candidate).where(Candidate.id == candidate_id))
+        db.commit()
+    
+    if file_path:
+        get_file_cleanup_executor().submit(remove_file, file_path)
+
+
+def invalidate_candidates() -> None:
+    """
+    Drop cached candidate lists after an upload or delete
+    Also bumps analysis_version, which keys the Analysis Results overview cache
+    """
+    load_candidates.clear()
+    st.session_state["candidates_version"] = st.session_state.get("candidates_version", 0) + 1
+    st.session_state["analysis_version"] = st.session_state.get("analysis_version", 0) + 1
+
 
 # Page config
 st.set_page_config(
@@ -33,46 +246,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .upload-section {
-        background-color: #f0f2f6;
-        padding: 2rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .candidate-card {
-        background-color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 4px solid #1f77b4;
-    }
-    .candidate-name {
-        font-size: 1.2rem;
-        font-weight: bold;
-        color: #1f77b4;
-    }
-    .candidate-info {
-        color: #666;
-        font-size: 0.9rem;
-    }
-    .success-badge {
-        background-color: #28a745;
-        color: white;
-        padding: 0.2rem 0.6rem;
-        border-radius: 4px;
-        font-size: 0.8rem;
-    }
-    .pending-badge {
-        background-color: #ffc107;
-        color: black;
-        padding: 0.2rem 0.6rem;
-        border-radius: 4px;
-        font-size: 0.8rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_styles("candidate_upload")
 
 # Header
 st.title("Candidate Upload")
@@ -116,8 +290,10 @@ try:
             if selected_job.department:
                 st.markdown(f"**Department:** {selected_job.department}")
             
-            # Show existing candidates count
-            candidate_count = len(selected_job.candidates) if selected_job.candidates else 0
+            # Show existing candidates count (counted in SQL, not by loading rows)
+            candidate_count = db.query(func.count(Candidate.id)).filter(
+                Candidate.job_id == selected_job_id
+            ).scalar()
             st.markdown(f"**Current Candidates:** {candidate_count}")
 
 except Exception as e:
@@ -159,76 +335,95 @@ if uploaded_files:
         upload_results = []
         
         # Ensure upload directory exists
-        upload_dir = settings.get_upload_path()
+        upload_dir = ensure_directory_exists(settings.UPLOAD_FOLDER)
         
-        for idx, uploaded_file in enumerate(uploaded_files):
-            try:
-                status_text.text(f"Processing {idx + 1}/{len(uploaded_files)}: {uploaded_file.name}")
-                
-                # Generate unique filename
-                unique_filename = generate_unique_filename(uploaded_file.name)
-                file_path = safe_file_path(str(upload_dir), unique_filename)
-                
-                # Save file
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                file_size = os.path.getsize(file_path)
-                
-                # Parse resume
-                parse_result = parse_resume(
-                    file_path=str(file_path),
-                    filename=uploaded_file.name,
-                    file_size=file_size
-                )
+        # Parsed candidates are inserted together once parsing finishes
+        new_candidates = []
+        parsed_results = []
+        
+        # Save and parse files concurrently
+        completed = 0
+        total_files = len(uploaded_files)
+        progress_step = max(1, total_files // MAX_PROGRESS_UPDATES)
+        # Workers share this run's context so st.cache_data works from their threads
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARSE_WORKERS, len(uploaded_files)),
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        ) as executor:
+            futures = {
+                executor.submit(save_and_parse_resume, uploaded_file, upload_dir): uploaded_file.name
+                for uploaded_file in uploaded_files
+            }
+            
+            for future in as_completed(futures):
+                filename = futures[future]
+                completed += 1
                 
-                if parse_result["success"]:
-                    # Save to database
-                    with DatabaseSession() as db:
+                try:
+                    file_path, file_size, parse_result = future.result()
+                    
+                    if parse_result["success"]:
                         candidate_info = parse_result["candidate_info"]
                         
                         new_candidate = Candidate(
                             job_id=selected_job_id,
-                            name=candidate_info.get("name", uploaded_file.name),
+                            name=candidate_info.get("name", filename),
                             email=candidate_info.get("email"),
                             phone=candidate_info.get("phone"),
-                            file_name=uploaded_file.name,
+                            file_name=filename,
                             file_path=str(file_path),
                             file_type=parse_result["file_info"]["file_type"],
                             file_size=file_size,
                             parsed_text=parse_result["cleaned_text"]
                         )
+                        new_candidates.append(new_candidate)
                         
-                        db.add(new_candidate)
-                        db.commit()
-                        
-                        upload_results.append({
-                            "filename": uploaded_file.name,
+                        # Capture display fields now; instances expire after commit
+                        parsed_results.append({
+                            "filename": filename,
                             "success": True,
                             "name": new_candidate.name,
                             "email": new_candidate.email,
                             "message": "Successfully uploaded and parsed"
                         })
-                else:
-                    # Delete file if parsing failed
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    
+                    else:
+                        # Delete file if parsing failed
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                        
+                        upload_results.append({
+                            "filename": filename,
+                            "success": False,
+                            "error": parse_result["error"]
+                        })
+                
+                except Exception as e:
                     upload_results.append({
-                        "filename": uploaded_file.name,
+                        "filename": filename,
                         "success": False,
-                        "error": parse_result["error"]
+                        "error": str(e)
                     })
                 
-            except Exception as e:
-                upload_results.append({
-                    "filename": uploaded_file.name,
-                    "success": False,
-                    "error": str(e)
-                })
+                # Update progress (throttled so large batches don't flood the client)
+                if completed % progress_step == 0 or completed == total_files:
+                    status_text.text(f"Processed {completed}/{total_files}: {filename}")
+                    progress_bar.progress(completed / total_files)
+        
+        # Save to database in a single transaction
+        if new_candidates:
+            status_text.text(f"Saving {len(new_candidates)} candidate(s)...")
+            try:
+                with DatabaseSession() as db:
+                    db.add_all(new_candidates)
+                upload_results.extend(parsed_results)
+                invalidate_candidates()
             
-            # Update progress
-            progress_bar.progress((idx + 1) / len(uploaded_files))
+            except Exception as e:
+                upload_results.extend(
+                    {"filename": result["filename"], "success": False, "error": str(e)}
+                    for result in parsed_results
+                )
         
         status_text.empty()
         progress_bar.empty()
@@ -268,11 +463,19 @@ st.markdown("---")
 
 st.subheader("Step 3: View Uploaded Candidates")
 
-try:
-    with DatabaseSession() as db:
-        candidates = db.query(Candidate).filter(
-            Candidate.job_id == selected_job_id
-        ).order_by(Candidate.uploaded_at.desc()).all()
+
+@fragment
+def render_candidate_list(selected_job_id: int) -> None:
+    """
+    Render the searchable candidate list for a job
+    Runs as a fragment where supported, so searching and deleting don't rerun the page
+    
+    Args:
+        selected_job_id: Job database ID
+    """
+    try:
+        candidates_version = st.session_state.get("candidates_version", 0)
+        candidates = load_candidates(selected_job_id, candidates_version)
         
         if not candidates:
             st.info("No candidates uploaded yet for this job.")
@@ -288,82 +491,84 @@ try:
             
             # Filter candidates
             filtered_candidates = candidates
-            if search_candidate:
+            if len(search_candidate) >= MIN_SQL_SEARCH_LENGTH:
+                filtered_candidates = load_candidates(selected_job_id, candidates_version, search_candidate)
+            elif search_candidate:
                 search_lower = search_candidate.lower()
-                filtered_candidates = [
-                    c for c in candidates
-                    if search_lower in c.name.lower() or
-                    (c.email and search_lower in c.email.lower())
-                ]
+                filtered_candidates = [c for c in candidates if search_lower in c["search_text"]]
             
             st.markdown(f"**Showing {len(filtered_candidates)} candidate(s)**")
             
+            # Delete confirmation (one pending delete per session, shown above the list)
+            pending_delete_id = st.session_state.get("pending_delete_id")
+            if pending_delete_id is not None:
+                pending = next((c for c in candidates if c["id"] == pending_delete_id), None)
+                
+                if pending is None:
+                    # Candidate belongs to another job or is already gone
+                    del st.session_state["pending_delete_id"]
+                else:
+                    st.warning(f"Delete candidate '{pending['name']}'?")
+                    
+                    confirm_col1, confirm_col2 = st.columns(2)
+                    with confirm_col1:
+                        if st.button("Yes", key="confirm_delete_candidate"):
+                            delete_candidate(pending_delete_id, pending["file_path"])
+                            invalidate_candidates()
+                            st.success(f"Candidate '{pending['name']}' deleted!")
+                            del st.session_state["pending_delete_id"]
+                            st.rerun()
+                    
+                    with confirm_col2:
+                        if st.button("Cancel", key="cancel_delete_candidate"):
+                            del st.session_state["pending_delete_id"]
+                            st.rerun()
+                
+                st.markdown("---")
+            
             # Display candidates
             for candidate in filtered_candidates:
+                candidate_id = candidate["id"]
+                
                 with st.container():
                     col1, col2, col3 = st.columns([3, 2, 1])
                     
                     with col1:
-                        st.markdown(f'<div class="candidate-name">{candidate.name}</div>', unsafe_allow_html=True)
+                        st.markdown(f'<div class="candidate-name">{candidate["name"]}</div>', unsafe_allow_html=True)
                         
                         info_parts = []
-                        if candidate.email:
-                            info_parts.append(f"Email: {candidate.email}")
-                        if candidate.phone:
-                            info_parts.append(f"Phone: {candidate.phone}")
+                        if candidate["email"]:
+                            info_parts.append(f"Email: {candidate['email']}")
+                        if candidate["phone"]:
+                            info_parts.append(f"Phone: {candidate['phone']}")
                         
                         if info_parts:
                             st.markdown(f'<div class="candidate-info">{" | ".join(info_parts)}</div>', unsafe_allow_html=True)
                     
                     with col2:
-                        st.markdown(f"**File:** {candidate.file_name}")
-                        st.markdown(f"**Size:** {format_file_size(candidate.file_size)}")
-                        st.markdown(f"**Uploaded:** {get_time_ago(candidate.uploaded_at)}")
+                        st.markdown(f"**File:** {candidate['file_name']}")
+                        st.markdown(f"**Size:** {format_file_size(candidate['file_size'])}")
+                        st.markdown(f"**Uploaded:** {get_time_ago(candidate['uploaded_at'])}")
                     
                     with col3:
                         # Analysis status
-                        if candidate.analysis_result:
+                        if candidate["has_analysis"]:
                             st.markdown('<span class="success-badge">Analyzed</span>', unsafe_allow_html=True)
                         else:
                             st.markdown('<span class="pending-badge">Pending</span>', unsafe_allow_html=True)
                         
                         # Delete button
-                        if st.button("Delete", key=f"del_cand_{candidate.id}", use_container_width=True):
-                            st.session_state[f"delete_candidate_{candidate.id}"] = True
-                    
-                    # Delete confirmation
-                    if st.session_state.get(f"delete_candidate_{candidate.id}", False):
-                        st.warning(f"Delete candidate '{candidate.name}'?")
-                        
-                        confirm_col1, confirm_col2 = st.columns(2)
-                        with confirm_col1:
-                            if st.button("Yes", key=f"confirm_del_{candidate.id}"):
-                                with DatabaseSession() as del_db:
-                                    cand_to_delete = del_db.query(Candidate).filter(
-                                        Candidate.id == candidate.id
-                                    ).first()
-                                    
-                                    if cand_to_delete:
-                                        # Delete file
-                                        if cand_to_delete.file_path and os.path.exists(cand_to_delete.file_path):
-                                            os.remove(cand_to_delete.file_path)
-                                        
-                                        del_db.delete(cand_to_delete)
-                                        del_db.commit()
-                                        
-                                        st.success(f"Candidate '{candidate.name}' deleted!")
-                                        del st.session_state[f"delete_candidate_{candidate.id}"]
-                                        st.rerun()
-                        
-                        with confirm_col2:
-                            if st.button("Cancel", key=f"cancel_del_{candidate.id}"):
-                                del st.session_state[f"delete_candidate_{candidate.id}"]
-                                st.rerun()
+                        if st.button("Delete", key=f"del_cand_{candidate_id}", use_container_width=True):
+                            st.session_state["pending_delete_id"] = candidate_id
+                            st.rerun()
                     
                     st.markdown("---")
 
-except Exception as e:
-    st.error(f"Error loading candidates: {str(e)}")
+    except Exception as e:
+        st.error(f"Error loading candidates: {str(e)}")
+
+
+render_candidate_list(selected_job_id)
 
 # Footer
 st.markdown("---")
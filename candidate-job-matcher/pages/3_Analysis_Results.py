@@ -3,27 +3,38 @@ Analysis Results Page
 View and manage candidate analysis results
 """
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 import streamlit as st
+import html
+import math
+import time
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
+from sqlalchemy import exists, select
 
 from app.database import DatabaseSession, Job, Candidate, AnalysisResult, AnalysisStatus
 from app.services.analysis_service import (
     analyze_and_store_candidate,
     analyze_all_candidates_for_job,
-    get_candidates_with_analysis,
+    get_analysis_overview,
     get_analysis_statistics
 )
-from app.utils.helpers import format_percentage, get_time_ago
+from app.services.export_service import generate_csv
+from app.utils.helpers import format_percentage, get_time_ago, safe_filename_part
+from app.ui import fragment, inject_styles
+
+# Seconds between reruns while a background batch analysis is running
+ANALYSIS_POLL_INTERVAL = 0.5
+
+# Candidates rendered per page in the Detailed Cards view
+CARDS_PER_PAGE = 20
+
+# Score thresholds (inclusive lower bounds) and the CSS class for each bucket
+SCORE_CLASS_THRESHOLDS = [60, 80]
+SCORE_CLASSES = np.array(["score-low", "score-medium", "score-high"])
 
 # Page config
 st.set_page_config(
@@ -33,57 +44,165 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-    }
-    .score-high {
-        color: #28a745;
-        font-size: 2rem;
-        font-weight: bold;
-    }
-    .score-medium {
-        color: #ffc107;
-        font-size: 2rem;
-        font-weight: bold;
-    }
-    .score-low {
-        color: #dc3545;
-        font-size: 2rem;
-        font-weight: bold;
-    }
-    .candidate-card {
-        background-color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        border-left: 5px solid #1f77b4;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .skill-badge {
-        display: inline-block;
-        background-color: #e3f2fd;
-        color: #1976d2;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        margin: 0.2rem;
-        font-size: 0.85rem;
-    }
-    .skill-badge-missing {
-        display: inline-block;
-        background-color: #ffebee;
-        color: #c62828;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        margin: 0.2rem;
-        font-size: 0.85rem;
+inject_styles("analysis_results")
+
+# ==========================================
+# Data Loading
+# ==========================================
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_analysis_overview(job_id: int, version: int) -> tuple:
+    """
+    Cached get_analysis_overview(): statistics and candidates from one session
+    Sort orderings are computed here too, so they always match the cached list
+    
+    Args:
+        job_id: Job database ID
+        version: Session's analysis_version token; bumped when analyses or candidates change
+        
+    Returns:
+        Tuple of (statistics, candidates with analysis data highest score first,
+        index orderings for every sort option)
+    """
+    stats, candidates = get_analysis_overview(job_id, sort_by="score")
+    return stats, candidates, build_candidate_orderings(candidates)
+
+
+def invalidate_analysis() -> None:
+    """
+    Drop cached analysis data after a batch run or an explicit refresh
+    """
+    load_analysis_overview.clear()
+    build_summary_csv.clear()
+    st.session_state["analysis_version"] = st.session_state.get("analysis_version", 0) + 1
+
+
+# ==========================================
+# Background Batch Analysis
+# ==========================================
+
+@st.cache_resource
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """
+    Shared executor that runs batch analyses off the script thread
+    
+    Returns:
+        Process-wide ThreadPoolExecutor
+    """
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="batch-analysis")
+
+
+def start_batch_analysis(job_id: int) -> None:
+    """
+    Submit analyze_all_candidates_for_job() in the background and track it in session state
+    
+    Args:
+        job_id: Job database ID
+    """
+    # Plain dict updated by the worker thread; the script only reads it
+    progress = {"completed": 0, "total": 0}
+    
+    def on_progress(completed: int, total: int) -> None:
+        progress["completed"] = completed
+        progress["total"] = total
+    
+    future = get_analysis_executor().submit(analyze_all_candidates_for_job, job_id, on_progress)
+    st.session_state["analysis_task"] = {"job_id": job_id, "future": future, "progress": progress, "seen": 0}
+
+
+def poll_batch_analysis() -> Optional[dict]:
+    """
+    Check the session's background analysis, refreshing cached results as candidates finish
+    
+    Returns:
+        The running task, or None once it has finished (its result is left in
+        st.session_state["analysis_outcome"] for display)
+    """
+    task = st.session_state.get("analysis_task")
+    if task is None:
+        return None
+    
+    if task["future"].done():
+        del st.session_state["analysis_task"]
+        st.session_state["analysis_outcome"] = task["future"].result()
+        invalidate_analysis()
+        return None
+    
+    # Show partial results as each candidate completes
+    if task["progress"]["completed"] != task["seen"]:
+        task["seen"] = task["progress"]["completed"]
+        invalidate_analysis()
+    
+    return task
+
+
+SORT_OPTIONS = {
+    "Relevance Score (High to Low)": "score_desc",
+    "Relevance Score (Low to High)": "score_asc",
+    "Name (A-Z)": "name",
+    "Upload Date (Recent First)": "date",
+}
+
+
+def build_candidate_orderings(candidates: list) -> dict:
+    """
+    Index orderings for every sort option over one loaded candidate list
+    
+    Args:
+        candidates: Candidate list the indices refer to
+        
+    Returns:
+        Dictionary mapping ordering key to a list of indices into candidates
+    """
+    indices = range(len(candidates))
+    orderings = {
+        "score_desc": sorted(
+            indices,
+            key=lambda i: candidates[i]["analysis"]["relevance_score"] if candidates[i]["has_analysis"] else -1,
+            reverse=True
+        ),
+        "score_asc": sorted(
+            indices,
+            key=lambda i: candidates[i]["analysis"]["relevance_score"] if candidates[i]["has_analysis"] else 999
+        ),
+        "name": sorted(indices, key=lambda i: candidates[i]["name"]),
+        "date": sorted(indices, key=lambda i: candidates[i]["uploaded_at"], reverse=True),
     }
-    </style>
-""", unsafe_allow_html=True)
+    
+    return orderings
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_summary_csv(job_id: int, data_fingerprint: tuple, _table_columns: dict) -> bytes:
+    """
+    Encode the summary table as CSV once per job and displayed rows
+    
+    Args:
+        job_id: Job database ID
+        data_fingerprint: (candidate id, analysis updated_at) of each table row, in order
+        _table_columns: Table columns (not hashed; built from the rows in data_fingerprint)
+        
+    Returns:
+        UTF-8 encoded CSV
+    """
+    # Score as one-decimal text, as in the table; Arrow would write 85.0 as 85
+    return generate_csv(dict(_table_columns, Score=np.char.mod("%.1f", _table_columns["Score"]).tolist()))
+
+
+@st.cache_data(show_spinner=False)
+def render_skill_badges(skills: tuple, badge_class: str) -> str:
+    """
+    Render a candidate's skills as one HTML badge string; cached so reruns reuse the markup
+    
+    Args:
+        skills: Skill names
+        badge_class: CSS class for each badge ("skill-badge" or "skill-badge-missing")
+        
+    Returns:
+        Space-separated, HTML-escaped badge spans
+    """
+    return " ".join(f'<span class="{badge_class}">{html.escape(skill)}</span>' for skill in skills)
+
 
 # Header
 st.title("Analysis Results")
@@ -114,11 +233,16 @@ try:
         
         selected_job_id = job_options[selected_job_display]
         selected_job = db.query(Job).filter(Job.id == selected_job_id).first()
+        selected_job_title = selected_job.title
+        # Filename-safe title, computed once here rather than inside the download widget
+        job_title_safe = safe_filename_part(selected_job_title)
         
-        # Get candidates count
-        candidates_count = db.query(Candidate).filter(Candidate.job_id == selected_job_id).count()
+        # Only need to know whether any candidate exists; EXISTS stops at the first row
+        has_candidates = db.scalar(
+            select(exists().where(Candidate.job_id == selected_job_id))
+        )
         
-        if candidates_count == 0:
+        if not has_candidates:
             st.info("No candidates found for this job. Please upload resumes in the 'Candidate Upload' page.")
             st.stop()
 
@@ -134,7 +258,9 @@ st.markdown("---")
 
 st.subheader("Analysis Statistics")
 
-stats = get_analysis_statistics(selected_job_id)
+analysis_task = poll_batch_analysis()
+analysis_version = st.session_state.get("analysis_version", 0)
+stats, candidates_data, orderings = load_analysis_overview(selected_job_id, analysis_version)
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -167,30 +293,34 @@ st.subheader("Run Analysis")
 action_col1, action_col2 = st.columns(2)
 
 with action_col1:
-    if st.button("Analyze All Candidates", type="primary", use_container_width=True):
-        if stats["pending"] == 0:
+    if analysis_task:
+        completed = analysis_task["progress"]["completed"]
+        total = analysis_task["progress"]["total"]
+        st.progress(
+            completed / total if total else 0.0,
+            text=f"Analyzing candidates... {completed}/{total or '?'} done. This may take a few minutes."
+        )
+    elif st.button("Analyze All Candidates", type="primary", use_container_width=True):
+        # Fresh count rather than the cached overview, so recent uploads are never skipped
+        if get_analysis_statistics(selected_job_id)["pending"] == 0:
             st.info("All candidates have already been analyzed!")
         else:
-            with st.spinner(f"Analyzing {stats['pending']} candidate(s)... This may take a few minutes."):
-                
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                result = analyze_all_candidates_for_job(selected_job_id)
-                
-                progress_bar.empty()
-                status_text.empty()
-                
-                if result["success"]:
-                    st.success(f"Analysis complete! {result['analyzed']}/{result['total_candidates']} candidates analyzed successfully.")
-                    if result["failed"] > 0:
-                        st.warning(f"{result['failed']} candidate(s) failed analysis.")
-                    st.rerun()
-                else:
-                    st.error(f"Analysis failed: {result['error']}")
+            start_batch_analysis(selected_job_id)
+            st.rerun()
+    
+    # Outcome of a background run that finished since the last rerun
+    result = st.session_state.pop("analysis_outcome", None)
+    if result:
+        if result["success"]:
+            st.success(f"Analysis complete! {result['analyzed']}/{result['total_candidates']} candidates analyzed successfully.")
+            if result["failed"] > 0:
+                st.warning(f"{result['failed']} candidate(s) failed analysis.")
+        else:
+            st.error(f"Analysis failed: {result['error']}")
 
 with action_col2:
     if st.button("Refresh Results", use_container_width=True):
+        invalidate_analysis()
         st.rerun()
 
 st.markdown("---")
@@ -201,36 +331,18 @@ st.markdown("---")
 
 st.subheader("Candidate Rankings")
 
-# Get candidates with analysis
-candidates_data = get_candidates_with_analysis(selected_job_id, sort_by="score")
-
 # Filter options
 filter_col1, filter_col2 = st.columns([2, 2])
 
 with filter_col1:
     sort_option = st.selectbox(
         "Sort By",
-        ["Relevance Score (High to Low)", "Relevance Score (Low to High)", "Name (A-Z)", "Upload Date (Recent First)"],
+        list(SORT_OPTIONS),
         key="sort_candidates"
     )
     
-    # Apply sorting
-    if sort_option == "Relevance Score (High to Low)":
-        candidates_data = sorted(
-            candidates_data,
-            key=lambda x: x["analysis"]["relevance_score"] if x["has_analysis"] else -1,
-            reverse=True
-        )
-    elif sort_option == "Relevance Score (Low to High)":
-        candidates_data = sorted(
-            candidates_data,
-            key=lambda x: x["analysis"]["relevance_score"] if x["has_analysis"] else 999,
-            reverse=False
-        )
-    elif sort_option == "Name (A-Z)":
-        candidates_data = sorted(candidates_data, key=lambda x: x["name"])
-    elif sort_option == "Upload Date (Recent First)":
-        candidates_data = sorted(candidates_data, key=lambda x: x["uploaded_at"], reverse=True)
+    # Apply sorting (orderings are cached alongside the candidate list)
+    candidates_data = [candidates_data[i] for i in orderings[SORT_OPTIONS[sort_option]]]
 
 with filter_col2:
     min_score = st.slider(
@@ -266,17 +378,34 @@ else:
     
     if display_mode == "Detailed Cards":
         
-        for idx, candidate in enumerate(candidates_data, 1):
+        # Paginate so each rerun renders at most CARDS_PER_PAGE cards
+        page_count = max(1, math.ceil(len(candidates_data) / CARDS_PER_PAGE))
+        page = 1
+        if page_count > 1:
+            # Seed the widget state, then clamp a page left over from a larger result set;
+            # no value= on the widget, since its state is set through Session State
+            st.session_state.setdefault("results_page", 1)
+            if st.session_state["results_page"] > page_count:
+                st.session_state["results_page"] = page_count
+            page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="results_page")
+            st.caption(f"Page {page} of {page_count}")
+        
+        start = (page - 1) * CARDS_PER_PAGE
+        page_candidates = candidates_data[start:start + CARDS_PER_PAGE]
+        
+        # Score color for the whole page in one searchsorted call
+        page_scores = np.fromiter(
+            (c["analysis"]["relevance_score"] for c in page_candidates),
+            dtype=np.float64,
+            count=len(page_candidates)
+        )
+        score_classes = SCORE_CLASSES[np.searchsorted(SCORE_CLASS_THRESHOLDS, page_scores, side="right")]
+        
+        for offset, candidate in enumerate(page_candidates):
+            idx = start + offset + 1
             analysis = candidate["analysis"]
             score = analysis["relevance_score"]
-            
-            # Score color
-            if score >= 80:
-                score_class = "score-high"
-            elif score >= 60:
-                score_class = "score-medium"
-            else:
-                score_class = "score-low"
+            score_class = score_classes[offset]
             
             with st.container():
                 # Header row
@@ -303,21 +432,19 @@ else:
                     st.metric("Missing Skills", missing_count)
                 
                 with metric_col3:
-                    if analysis.get("experience_match"):
+                    if analysis["experience_match"]:
                         st.metric("Experience Match", f"{analysis['experience_match']:.0f}%")
                 
                 # Skills section
                 st.markdown("**Matched Skills:**")
                 if analysis["matched_skills"]:
-                    skills_html = " ".join([f'<span class="skill-badge">{skill}</span>' for skill in analysis["matched_skills"]])
-                    st.markdown(skills_html, unsafe_allow_html=True)
+                    st.markdown(render_skill_badges(tuple(analysis["matched_skills"]), "skill-badge"), unsafe_allow_html=True)
                 else:
                     st.caption("None identified")
                 
                 st.markdown("**Missing Skills:**")
                 if analysis["missing_skills"]:
-                    skills_html = " ".join([f'<span class="skill-badge-missing">{skill}</span>' for skill in analysis["missing_skills"]])
-                    st.markdown(skills_html, unsafe_allow_html=True)
+                    st.markdown(render_skill_badges(tuple(analysis["missing_skills"]), "skill-badge-missing"), unsafe_allow_html=True)
                 else:
                     st.caption("None identified")
                 
@@ -326,12 +453,12 @@ else:
                     st.markdown("**AI Analysis:**")
                     st.write(analysis["feedback"])
                     
-                    if analysis.get("strengths"):
+                    if analysis["strengths"]:
                         st.markdown("**Strengths:**")
                         for strength in analysis["strengths"]:
                             st.markdown(f"- {strength}")
                     
-                    if analysis.get("weaknesses"):
+                    if analysis["weaknesses"]:
                         st.markdown("**Areas for Improvement:**")
                         for weakness in analysis["weaknesses"]:
                             st.markdown(f"- {weakness}")
@@ -345,21 +472,23 @@ else:
     # ==========================================
     
     else:
-        # Prepare dataframe
-        table_data = []
-        for idx, candidate in enumerate(candidates_data, 1):
-            analysis = candidate["analysis"]
-            table_data.append({
-                "Rank": idx,
-                "Name": candidate["name"],
-                "Email": candidate.get("email", "N/A"),
-                "Score": f"{analysis['relevance_score']:.1f}",
-                "Matched Skills": len(analysis["matched_skills"]),
-                "Missing Skills": len(analysis["missing_skills"]),
-                "Experience Match": f"{analysis.get('experience_match', 0):.0f}%" if analysis.get('experience_match') else "N/A"
-            })
+        # Prepare dataframe column-wise rather than one dict per row
+        count = len(candidates_data)
+        analyses = [c["analysis"] for c in candidates_data]
+        experience = np.array([a["experience_match"] for a in analyses], dtype=np.float64)
         
-        df = pd.DataFrame(table_data)
+        table_columns = {
+            "Rank": np.arange(1, count + 1),
+            "Name": [c["name"] for c in candidates_data],
+            "Email": [c["email"] for c in candidates_data],
+            "Score": np.fromiter((a["relevance_score"] for a in analyses), dtype=np.float64, count=count).round(1),
+            "Matched Skills": np.fromiter((len(a["matched_skills"]) for a in analyses), dtype=np.int32, count=count),
+            "Missing Skills": np.fromiter((len(a["missing_skills"]) for a in analyses), dtype=np.int32, count=count),
+            "Experience Match": np.where(
+                np.nan_to_num(experience) != 0, np.char.mod("%.0f%%", experience), "N/A"
+            ).tolist()
+        }
+        df = pd.DataFrame(table_columns)
         
         # Display table
         st.dataframe(
@@ -375,12 +504,14 @@ else:
             }
         )
         
-        # Download CSV
-        csv = df.to_csv(index=False)
+        # Download CSV (date token fixed per session so the file name stays stable across reruns)
+        export_date = st.session_state.setdefault("export_date_token", datetime.now().strftime("%Y%m%d"))
+        data_fingerprint = tuple((c["id"], c["analysis"]["updated_at"]) for c in candidates_data)
+        csv = build_summary_csv(selected_job_id, data_fingerprint, table_columns)
         st.download_button(
             label="Download Table as CSV",
             data=csv,
-            file_name=f"candidates_analysis_{selected_job.title}_{datetime.now().strftime('%Y%m%d')}.csv",
+            file_name=f"candidates_analysis_{job_title_safe}_{export_date}.csv",
             mime="text/csv",
             use_container_width=True
         )
@@ -389,7 +520,69 @@ else:
 # Visualizations
 # ==========================================
 
-if candidates_data:
+@st.cache_data(show_spinner=False)
+def build_score_histogram(scores: tuple) -> go.Figure:
+    """
+    Build the score distribution histogram; cached so unchanged scores skip figure construction
+    
+    Args:
+        scores: Relevance scores of analyzed candidates
+        
+    Returns:
+        Plotly histogram figure
+    """
+    # Imported lazily: plotly.express is slow to import and only needed on a cache miss
+    import plotly.express as px
+    
+    fig = px.histogram(
+        list(scores),
+        nbins=10,
+        title="Score Distribution",
+        labels={"value": "Relevance Score", "count": "Number of Candidates"},
+        color_discrete_sequence=["#1f77b4"]
+    )
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def build_top_candidates_chart(names: tuple, scores: tuple) -> go.Figure:
+    """
+    Build the top-candidates bar chart; cached on the displayed names and scores
+    
+    Args:
+        names: Candidate names, best first
+        scores: Matching relevance scores
+        
+    Returns:
+        Plotly horizontal bar figure
+    """
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(scores),
+            y=list(names),
+            orientation='h',
+            marker_color='#1f77b4'
+        )
+    ])
+    fig.update_layout(
+        title=f"Top {len(names)} Candidates",
+        xaxis_title="Relevance Score",
+        yaxis_title="Candidate",
+        yaxis=dict(autorange="reversed")
+    )
+    return fig
+
+
+@fragment
+def render_visualizations(candidates_data: list) -> None:
+    """
+    Render the score distribution and top-candidate charts
+    Runs as a fragment where supported, isolating chart rebuilds from page reruns
+    
+    Args:
+        candidates_data: Filtered, sorted candidate dictionaries
+    """
     st.markdown("---")
     st.subheader("Analysis Visualizations")
     
@@ -397,42 +590,29 @@ if candidates_data:
     
     with viz_col1:
         # Score distribution
-        scores = [c["analysis"]["relevance_score"] for c in candidates_data if c["has_analysis"]]
+        scores = tuple(c["analysis"]["relevance_score"] for c in candidates_data if c["has_analysis"])
         
-        fig = px.histogram(
-            scores,
-            nbins=10,
-            title="Score Distribution",
-            labels={"value": "Relevance Score", "count": "Number of Candidates"},
-            color_discrete_sequence=["#1f77b4"]
-        )
-        fig.update_layout(showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_score_histogram(scores), use_container_width=True)
     
     with viz_col2:
         # Top candidates bar chart
         top_n = min(10, len(candidates_data))
         top_candidates = candidates_data[:top_n]
         
-        names = [c["name"] for c in top_candidates]
-        scores = [c["analysis"]["relevance_score"] for c in top_candidates]
+        names = tuple(c["name"] for c in top_candidates)
+        scores = tuple(c["analysis"]["relevance_score"] for c in top_candidates)
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=scores,
-                y=names,
-                orientation='h',
-                marker_color='#1f77b4'
-            )
-        ])
-        fig.update_layout(
-            title=f"Top {top_n} Candidates",
-            xaxis_title="Relevance Score",
-            yaxis_title="Candidate",
-            yaxis=dict(autorange="reversed")
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_top_candidates_chart(names, scores), use_container_width=True)
+
+
+if candidates_data:
+    render_visualizations(candidates_data)
 
 # Footer
 st.markdown("---")
-st.markdown("**Note:** Analysis is powered by Azure OpenAI GPT-4 and considers skills, experience, and overall fit.")
\ No newline at end of file
+st.markdown("**Note:** Analysis is powered by Azure OpenAI GPT-4 and considers skills, experience, and overall fit.")
+
+# Keep polling while a background analysis is running
+if analysis_task:
+    time.sleep(ANALYSIS_POLL_INTERVAL)
+    st.rerun()
\ No newline at end of file
@@ -3,23 +3,24 @@ Export Data Page
 Export candidate analysis results to CSV, JSON, and PDF formats
 """
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 import streamlit as st
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import io
-import json
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
 
 from app.database import DatabaseSession, Job, Candidate, AnalysisResult, AnalysisStatus
 from app.services.analysis_service import get_candidates_with_analysis
-from app.services.export_service import generate_pdf_report
+from app.services.export_service import generate_csv, generate_json, generate_pdf_report
+from app.utils.helpers import safe_filename_part
 from app.config import settings
+from app.ui import inject_styles
+
+# Seconds between reruns while a PDF report is being generated in the background
+PDF_POLL_INTERVAL = 0.5
 
 # Page config
 st.set_page_config(
@@ -29,23 +30,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .export-card {
-        background-color: #f0f2f6;
-        padding: 2rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .format-option {
-        background-color: white;
-        padding: 1.5rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border: 2px solid #1f77b4;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_styles("export_data")
 
 # Header
 st.title("Export Data")
@@ -60,7 +45,10 @@ st.subheader("Select Job to Export")
 
 try:
     with DatabaseSession() as db:
-        jobs = db.query(Job).order_by(Job.created_at.desc()).all()
+        # Only the columns the dropdown needs
+        jobs = db.execute(
+            select(Job.id, Job.title).order_by(Job.created_at.desc())
+        ).all()
         
         if not jobs:
             st.warning("No jobs found. Please create a job first.")
@@ -75,23 +63,28 @@ try:
         )
         
         selected_job_id = job_options[selected_job_display]
-        selected_job_obj = db.query(Job).filter(Job.id == selected_job_id).first()
         
-        # Extract data while still in session
-        selected_job = {
-            'id': selected_job_obj.id,
-            'title': selected_job_obj.title,
-            'description': selected_job_obj.description,
-            'requirements': selected_job_obj.requirements,
-            'location': selected_job_obj.location,
-            'department': selected_job_obj.department
-        }
+        # Plain dict of the fields used by the exports, not a full ORM instance
+        selected_job = dict(db.execute(
+            select(
+                Job.id,
+                Job.title,
+                Job.description,
+                Job.requirements,
+                Job.location,
+                Job.department
+            ).where(Job.id == selected_job_id)
+        ).one()._mapping)
         
         # Get analyzed candidates count
-        analyzed_count = db.query(AnalysisResult).join(Candidate).filter(
-            Candidate.job_id == selected_job_id,
-            AnalysisResult.status == AnalysisStatus.COMPLETED
-        ).count()
+        analyzed_count = db.scalar(
+            select(func.count(AnalysisResult.id))
+            .join(Candidate, Candidate.id == AnalysisResult.candidate_id)
+            .where(
+                Candidate.job_id == selected_job_id,
+                AnalysisResult.status == AnalysisStatus.COMPLETED
+            )
+        )
         
         if analyzed_count == 0:
             st.info("No analyzed candidates found for this job. Please run analysis first in the 'Analysis Results' page.")
@@ -147,97 +140,130 @@ st.markdown("---")
 
 st.subheader("Data Preview")
 
-# Get candidates data
-candidates_data = get_candidates_with_analysis(selected_job_id, sort_by="score")
+# Get candidates data; while a PDF report is still building, the poll reruns reuse
+# the rows it was started from instead of querying the database on every tick
+running_pdf = st.session_state.get("pdf_task")
+if (
+    export_format == "PDF Report"
+    and running_pdf is not None
+    and running_pdf["job_id"] == selected_job_id
+    and not running_pdf["future"].done()
+):
+    all_candidates = running_pdf["source"]
+else:
+    all_candidates = get_candidates_with_analysis(selected_job_id, sort_by="score")
 
 # Apply filters
-candidates_data = [c for c in candidates_data if c["has_analysis"] and c["analysis"]["relevance_score"] >= min_score_export]
+candidates_data = [c for c in all_candidates if c["has_analysis"] and c["analysis"]["relevance_score"] >= min_score_export]
+candidate_count = len(candidates_data)
+
+# Scores of the filtered candidates, reused for score sorting and the average
+scores = np.fromiter(
+    (c["analysis"]["relevance_score"] for c in candidates_data),
+    dtype=np.float64,
+    count=candidate_count
+)
 
-# Apply sorting
+# Apply sorting (stable, so tied scores keep their query order)
 if sort_by_export == "Relevance Score (High to Low)":
-    candidates_data = sorted(
-        candidates_data,
-        key=lambda x: x["analysis"]["relevance_score"],
-        reverse=True
-    )
+    candidates_data = [candidates_data[i] for i in np.argsort(-scores, kind="stable")]
 elif sort_by_export == "Relevance Score (Low to High)":
-    candidates_data = sorted(
-        candidates_data,
-        key=lambda x: x["analysis"]["relevance_score"],
-        reverse=False
-    )
+    candidates_data = [candidates_data[i] for i in np.argsort(scores, kind="stable")]
 elif sort_by_export == "Name (A-Z)":
     candidates_data = sorted(candidates_data, key=lambda x: x["name"])
 
-if not candidates_data:
+if not candidate_count:
     st.warning("No candidates match the selected filters.")
     st.stop()
 
-st.info(f"Ready to export {len(candidates_data)} candidate(s)")
+st.info(f"Ready to export {candidate_count} candidate(s)")
+
+# Count and average score, computed once for the previews and the export summary
+avg_score = float(scores.mean())
 
 # ==========================================
 # Generate Export Data
 # ==========================================
 
-def generate_csv_basic(candidates_data, job_title):
-    """Generate basic CSV export"""
-    data = []
-    for idx, candidate in enumerate(candidates_data, 1):
-        analysis = candidate["analysis"]
-        data.append({
-            "Rank": idx,
-            "Name": candidate["name"],
-            "Email": candidate.get("email", ""),
-            "Phone": candidate.get("phone", ""),
-            "Relevance Score": f"{analysis['relevance_score']:.2f}",
-            "Matched Skills Count": len(analysis["matched_skills"]),
-            "Missing Skills Count": len(analysis["missing_skills"]),
-            "Matched Skills": ", ".join(analysis["matched_skills"]),
-            "Missing Skills": ", ".join(analysis["missing_skills"]),
-            "Experience Match": f"{analysis.get('experience_match', 0):.1f}%" if analysis.get('experience_match') else "",
-            "Education Match": f"{analysis.get('education_match', 0):.1f}%" if analysis.get('education_match') else "",
-            "File Name": candidate["file_name"],
-            "Uploaded Date": candidate["uploaded_at"].strftime("%Y-%m-%d %H:%M:%S"),
-            "Analyzed Date": analysis["analyzed_at"].strftime("%Y-%m-%d %H:%M:%S") if analysis["analyzed_at"] else ""
-        })
+# Column order for each CSV export
+BASIC_EXPORT_COLUMNS = [
+    "Rank", "Name", "Email", "Phone", "Relevance Score",
+    "Matched Skills Count", "Missing Skills Count", "Matched Skills", "Missing Skills",
+    "Experience Match", "Education Match", "File Name", "Uploaded Date", "Analyzed Date"
+]
+DETAILED_EXPORT_COLUMNS = [
+    "Rank", "Name", "Email", "Phone", "Relevance Score",
+    "Matched Skills", "Missing Skills", "Strengths", "Weaknesses", "Feedback",
+    "Experience Match", "Education Match", "File Name", "Uploaded Date", "Analyzed Date"
+]
+
+def format_match_percent(values: np.ndarray) -> list:
+    """Format match percentages as "NN.N%" with numpy's formatter, blank where missing (NaN) or zero"""
+    return np.where(np.nan_to_num(values) != 0, np.char.mod("%.1f%%", values), "").tolist()
+
+def join_skills(skills):
+    """Join a skill list for export; empty and single-item lists skip str.join"""
+    if not skills:
+        return ""
+    if len(skills) == 1:
+        # str() so a non-string item from the LLM payload can't make the column mixed-type
+        return str(skills[0])
+    return ", ".join(skills)
+
+def build_export_columns(candidates_data, columns):
+    """Build the requested export columns column-wise; returns an ordered dict of header to values"""
+    count = len(candidates_data)
+    analyses = [c["analysis"] for c in candidates_data]
     
-    df = pd.DataFrame(data)
-    return df
+    builders = {
+        "Rank": lambda: np.arange(1, count + 1),
+        "Name": lambda: [c["name"] for c in candidates_data],
+        "Email": lambda: [c["email"] for c in candidates_data],
+        "Phone": lambda: [c["phone"] for c in candidates_data],
+        "Relevance Score": lambda: np.char.mod(
+            "%.2f", np.fromiter((a["relevance_score"] for a in analyses), dtype=np.float64, count=count)
+        ).tolist(),
+        "Matched Skills Count": lambda: np.fromiter((len(a["matched_skills"]) for a in analyses), dtype=np.int32, count=count),
+        "Missing Skills Count": lambda: np.fromiter((len(a["missing_skills"]) for a in analyses), dtype=np.int32, count=count),
+        "Matched Skills": lambda: [join_skills(a["matched_skills"]) for a in analyses],
+        "Missing Skills": lambda: [join_skills(a["missing_skills"]) for a in analyses],
+        "Strengths": lambda: [join_skills(a["strengths"]) for a in analyses],
+        "Weaknesses": lambda: [join_skills(a["weaknesses"]) for a in analyses],
+        "Feedback": lambda: [a["feedback"] for a in analyses],
+        "Experience Match": lambda: format_match_percent(
+            np.array([a["experience_match"] for a in analyses], dtype=np.float64)
+        ),
+        "Education Match": lambda: format_match_percent(
+            np.array([a["education_match"] for a in analyses], dtype=np.float64)
+        ),
+        "File Name": lambda: [c["file_name"] for c in candidates_data],
+        # isoformat(sep=" ", timespec="seconds") == strftime("%Y-%m-%d %H:%M:%S") for naive datetimes, without the format parse
+        "Uploaded Date": lambda: [
+            c["uploaded_at"].isoformat(sep=" ", timespec="seconds") for c in candidates_data
+        ],
+        "Analyzed Date": lambda: [
+            a["analyzed_at"].isoformat(sep=" ", timespec="seconds") if a["analyzed_at"] else "" for a in analyses
+        ],
+    }
+    
+    return {name: builders[name]() for name in columns}
+
+def generate_csv_basic(candidates_data, job_title):
+    """Generate basic CSV export columns"""
+    return build_export_columns(candidates_data, BASIC_EXPORT_COLUMNS)
 
 def generate_csv_detailed(candidates_data, job_title):
-    """Generate detailed CSV export with feedback"""
-    data = []
-    for idx, candidate in enumerate(candidates_data, 1):
-        analysis = candidate["analysis"]
-        data.append({
-            "Rank": idx,
-            "Name": candidate["name"],
-            "Email": candidate.get("email", ""),
-            "Phone": candidate.get("phone", ""),
-            "Relevance Score": f"{analysis['relevance_score']:.2f}",
-            "Matched Skills": ", ".join(analysis["matched_skills"]),
-            "Missing Skills": ", ".join(analysis["missing_skills"]),
-            "Strengths": ", ".join(analysis.get("strengths", [])),
-            "Weaknesses": ", ".join(analysis.get("weaknesses", [])),
-            "Feedback": analysis["feedback"],
-            "Experience Match": f"{analysis.get('experience_match', 0):.1f}%" if analysis.get('experience_match') else "",
-            "Education Match": f"{analysis.get('education_match', 0):.1f}%" if analysis.get('education_match') else "",
-            "File Name": candidate["file_name"],
-            "Uploaded Date": candidate["uploaded_at"].strftime("%Y-%m-%d %H:%M:%S"),
-            "Analyzed Date": analysis["analyzed_at"].strftime("%Y-%m-%d %H:%M:%S") if analysis["analyzed_at"] else ""
-        })
-    
-    df = pd.DataFrame(data)
-    return df
+    """Generate detailed CSV export columns with feedback"""
+    return build_export_columns(candidates_data, DETAILED_EXPORT_COLUMNS)
 
 def generate_json_export(candidates_data, job_info):
-    """Generate JSON export"""
+    """Generate JSON export data; datetimes are left for generate_json to serialize"""
     export_data = {
         "job": {
             "id": job_info['id'],
             "title": job_info['title'],
             "description": job_info['description'],
-            "export_date": datetime.now().isoformat()
+            "export_date": datetime.now()
         },
         "candidates": []
     }
@@ -247,37 +273,100 @@ def generate_json_export(candidates_data, job_info):
         export_data["candidates"].append({
             "rank": idx,
             "name": candidate["name"],
-            "email": candidate.get("email", ""),
-            "phone": candidate.get("phone", ""),
+            "email": candidate["email"],
+            "phone": candidate["phone"],
             "relevance_score": analysis["relevance_score"],
             "matched_skills": analysis["matched_skills"],
             "missing_skills": analysis["missing_skills"],
-            "strengths": analysis.get("strengths", []),
-            "weaknesses": analysis.get("weaknesses", []),
+            "strengths": analysis["strengths"],
+            "weaknesses": analysis["weaknesses"],
             "feedback": analysis["feedback"],
-            "experience_match": analysis.get("experience_match"),
-            "education_match": analysis.get("education_match"),
+            "experience_match": analysis["experience_match"],
+            "education_match": analysis["education_match"],
             "file_name": candidate["file_name"],
-            "uploaded_at": candidate["uploaded_at"].isoformat(),
-            "analyzed_at": analysis["analyzed_at"].isoformat() if analysis["analyzed_at"] else None
+            "uploaded_at": candidate["uploaded_at"],
+            "analyzed_at": analysis["analyzed_at"]
         })
     
     return export_data
 
+def deferred_download_button(label, build_data, file_name, mime, export_key):
+    """
+    Offer a download whose payload is only built when the user asks for it
+    download_button needs its data up front, so a Prepare button builds it once and
+    the result is kept in session state until export_key (job, format, filters, data) changes
+    """
+    prepared = st.session_state.get("prepared_export")
+    
+    if prepared is None or prepared["key"] != export_key:
+        if not st.button("Prepare Export", type="primary", use_container_width=True):
+            return
+        prepared = {"key": export_key, "data": build_data(), "file_name": file_name}
+        st.session_state["prepared_export"] = prepared
+    
+    st.download_button(
+        label=label,
+        data=prepared["data"],
+        file_name=prepared["file_name"],
+        mime=mime,
+        type="primary",
+        use_container_width=True
+    )
+
+@st.cache_resource
+def get_export_executor():
+    """Shared executor that builds PDF reports off the script thread"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-export")
+
+def get_pdf_task(export_key, file_name, job_info, candidates, source):
+    """
+    Return the session's background PDF build for export_key, starting one if needed
+    A change of job, filters, sort order or exported data starts a fresh build;
+    source (the unfiltered rows) is kept so poll reruns can skip the database query
+    """
+    task = st.session_state.get("pdf_task")
+    
+    if task is None or task["key"] != export_key:
+        future = get_export_executor().submit(
+            generate_pdf_report,
+            job_info=dict(job_info),
+            candidates_data=list(candidates)
+        )
+        task = {
+            "key": export_key,
+            "job_id": job_info["id"],
+            "future": future,
+            "file_name": file_name,
+            "source": source
+        }
+        st.session_state["pdf_task"] = task
+    
+    return task
+
+# Exported rows in order plus each analysis' last update, so re-analysis, uploads
+# and deletions invalidate prepared exports even when the filters stay the same
+data_fingerprint = tuple((c["id"], c["analysis"]["updated_at"]) for c in candidates_data)
+
+# Identifies the exported content; a prepared download is reused only while this is unchanged
+export_key = (selected_job_id, export_format, min_score_export, sort_by_export, data_fingerprint)
+
 # Preview table
 if export_format in ["CSV (Spreadsheet)", "Detailed CSV (with Feedback)"]:
+    # Only the previewed rows are built here; the full CSV is built on demand below
+    preview_candidates = candidates_data[:10]
     if export_format == "CSV (Spreadsheet)":
-        preview_df = generate_csv_basic(candidates_data, selected_job['title'])
+        preview_columns = generate_csv_basic(preview_candidates, selected_job['title'])
     else:
-        preview_df = generate_csv_detailed(candidates_data, selected_job['title'])
+        preview_columns = generate_csv_detailed(preview_candidates, selected_job['title'])
     
-    st.dataframe(preview_df.head(10), use_container_width=True)
-    if len(preview_df) > 10:
-        st.caption(f"Showing first 10 of {len(preview_df)} rows")
+    st.dataframe(pd.DataFrame(preview_columns), use_container_width=True)
+    if candidate_count > 10:
+        st.caption(f"Showing first 10 of {candidate_count} rows")
 
 elif export_format == "JSON":
-    json_data = generate_json_export(candidates_data, selected_job)
-    st.json(json_data, expanded=False)
+    # Serialize once: st.json takes the string as-is and the download reuses the bytes
+    json_bytes = generate_json(generate_json_export(candidates_data, selected_job))
+    st.json(json_bytes.decode("utf-8"), expanded=False)
 
 elif export_format == "PDF Report":
     st.info("PDF report will include: title page, executive summary, statistics, and detailed candidate analysis.")
@@ -285,8 +374,7 @@ elif export_format == "PDF Report":
     # Preview what will be in PDF
     st.markdown("**Report Contents:**")
     st.markdown(f"- Job Position: {selected_job['title']}")
-    st.markdown(f"- Total Candidates: {len(candidates_data)}")
-    avg_score = sum(c["analysis"]["relevance_score"] for c in candidates_data) / len(candidates_data)
+    st.markdown(f"- Total Candidates: {candidate_count}")
     st.markdown(f"- Average Score: {avg_score:.1f}/100")
     st.markdown(f"- Generated: {datetime.now().strftime('%B %d, %Y')}")
     
@@ -305,44 +393,37 @@ st.markdown("---")
 st.subheader("Download Export")
 
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-job_title_safe = selected_job['title'].replace(" ", "_").replace("/", "_")
+pdf_pending = False
+job_title_safe = safe_filename_part(selected_job['title'])
 
 if export_format == "CSV (Spreadsheet)":
-    df = generate_csv_basic(candidates_data, selected_job['title'])
-    csv = df.to_csv(index=False)
     filename = f"candidates_analysis_{job_title_safe}_{timestamp}.csv"
     
-    st.download_button(
+    deferred_download_button(
         label="Download CSV",
-        data=csv,
+        build_data=lambda: generate_csv(generate_csv_basic(candidates_data, selected_job['title'])),
         file_name=filename,
         mime="text/csv",
-        type="primary",
-        use_container_width=True
+        export_key=export_key
     )
 
 elif export_format == "Detailed CSV (with Feedback)":
-    df = generate_csv_detailed(candidates_data, selected_job['title'])
-    csv = df.to_csv(index=False)
     filename = f"candidates_detailed_{job_title_safe}_{timestamp}.csv"
     
-    st.download_button(
+    deferred_download_button(
         label="Download Detailed CSV",
-        data=csv,
+        build_data=lambda: generate_csv(generate_csv_detailed(candidates_data, selected_job['title'])),
         file_name=filename,
         mime="text/csv",
-        type="primary",
-        use_container_width=True
+        export_key=export_key
     )
 
 elif export_format == "JSON":
-    json_data = generate_json_export(candidates_data, selected_job)
-    json_str = json.dumps(json_data, indent=2)
     filename = f"candidates_analysis_{job_title_safe}_{timestamp}.json"
     
     st.download_button(
         label="Download JSON",
-        data=json_str,
+        data=json_bytes,
         file_name=filename,
         mime="application/json",
         type="primary",
@@ -350,31 +431,42 @@ elif export_format == "JSON":
     )
 
 elif export_format == "PDF Report":
-    try:
-        # Generate PDF
-        with st.spinner("Generating PDF report... This may take a few seconds."):
-            pdf_buffer = generate_pdf_report(
-                job_info=selected_job,
-                candidates_data=candidates_data
+    # Built in a background thread so the page stays responsive; polled below until done
+    pdf_task = get_pdf_task(
+        export_key,
+        f"candidates_report_{job_title_safe}_{timestamp}.pdf",
+        selected_job,
+        candidates_data,
+        all_candidates
+    )
+    
+    if not pdf_task["future"].done():
+        pdf_pending = True
+        st.info("Generating PDF report... This may take a few seconds.")
+    else:
+        try:
+            pdf_buffer = pdf_task["future"].result()
+            
+            st.download_button(
+                label="Download PDF Report",
+                data=pdf_buffer.getvalue(),
+                file_name=pdf_task["file_name"],
+                mime="application/pdf",
+                type="primary",
+                use_container_width=True
             )
+            
+            st.success("PDF report generated successfully! Click the button above to download.")
         
-        filename = f"candidates_report_{job_title_safe}_{timestamp}.pdf"
-        
-        st.download_button(
-            label="Download PDF Report",
-            data=pdf_buffer,
-            file_name=filename,
-            mime="application/pdf",
-            type="primary",
-            use_container_width=True
-        )
-        
-        st.success("PDF report generated successfully! Click the button above to download.")
-    
-    except Exception as e:
-        st.error(f"Error generating PDF: {str(e)}")
-        with st.expander("View Error Details"):
-            st.exception(e)
+        except Exception as e:
+            st.error(f"Error generating PDF: {str(e)}")
+            with st.expander("View Error Details"):
+                st.exception(e)
+            
+            # The failed build is kept under the same export_key; drop it to build again
+            if st.button("Retry PDF Report", use_container_width=True):
+                st.session_state.pop("pdf_task", None)
+                st.rerun()
 
 st.markdown("---")
 
@@ -390,10 +482,9 @@ with summary_col1:
     st.metric("Job Title", selected_job['title'])
 
 with summary_col2:
-    st.metric("Candidates Exported", len(candidates_data))
+    st.metric("Candidates Exported", candidate_count)
 
 with summary_col3:
-    avg_score = sum(c["analysis"]["relevance_score"] for c in candidates_data) / len(candidates_data)
     st.metric("Average Score", f"{avg_score:.1f}/100")
 
 # Additional info
@@ -412,4 +503,9 @@ st.markdown("**Export Formats:**")
 st.markdown("- **CSV (Spreadsheet):** Basic candidate information and scores - Easy to open in Excel")
 st.markdown("- **Detailed CSV:** Includes full feedback and analysis details - Complete data export")
 st.markdown("- **JSON:** Machine-readable format for further processing and integrations")
-st.markdown("- **PDF Report:** Professional formatted report with charts and detailed analysis")
\ No newline at end of file
+st.markdown("- **PDF Report:** Professional formatted report with charts and detailed analysis")
+
+# Keep polling while the PDF report is being generated
+if pdf_pending:
+    time.sleep(PDF_POLL_INTERVAL)
+    st.rerun()
\ No newline at end of file